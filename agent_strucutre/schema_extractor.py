@@ -6,6 +6,8 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SITEMAP_BATCH_SIZE = 10000
+
 def get_tenant_schema(mongo_uri: str, db_name: str, tenant_id: str) -> Dict[str, Any]:
     """
     Extract complete schema information for a tenant including:
@@ -33,31 +35,34 @@ def get_tenant_schema(mongo_uri: str, db_name: str, tenant_id: str) -> Dict[str,
     
     try:
         # Get all categories for this tenant
-        categories = {str(cat["_id"]): cat["name"] 
-                     for cat in db.categories.find({"tenant": tenant_obj_id})}
+        categories = {cat["_id"]: cat["name"] 
+                     for cat in db.categories.find({"tenant": tenant_obj_id}, {"name": 1}).batch_size(1000)}
         
         # Get category attributes mapping
         category_attrs = {}
-        for attr in db.category_attributes.find({"tenant": tenant_obj_id}):
-            category_id = str(attr["category"])
+        for attr in db.category_attributes.find(
+            {"tenant": tenant_obj_id}, {"name": 1, "category": 1}
+        ).batch_size(1000):
+            category_id = attr["category"]
             category_name = categories.get(category_id)
             if category_name:
-                category_attrs[str(attr["_id"])] = {
-                    "category_name": category_name,
-                    "attribute_name": attr["name"]
-                }
+                category_attrs[attr["_id"]] = (category_name, attr["name"])
         
         # Extract values from sitemaps
-        for doc in db.sitemaps.find({"tenant": tenant_obj_id}):
+        # Only the two fields used below, in large batches (few round-trips on big tenants)
+        sitemap_cursor = db.sitemaps.find(
+            {"tenant": tenant_obj_id}, {"_id": 0, "categoryAttribute": 1, "geoFocus": 1}
+        ).batch_size(SITEMAP_BATCH_SIZE)
+        for doc in sitemap_cursor:
             # Category attributes
             attr_ids = doc.get("categoryAttribute", [])
             for attr_id in attr_ids:
-                attr_info = category_attrs.get(str(attr_id))
+                attr_info = category_attrs.get(attr_id)
                 if attr_info:
-                    cat_name = attr_info["category_name"]
+                    cat_name, attr_name = attr_info
                     if cat_name not in categories_data:
                         categories_data[cat_name] = set()
-                    categories_data[cat_name].add(attr_info["attribute_name"])
+                    categories_data[cat_name].add(attr_name)
             
             # Language (geoFocus)
             geo_focus = doc.get("geoFocus")
@@ -66,17 +71,11 @@ def get_tenant_schema(mongo_uri: str, db_name: str, tenant_id: str) -> Dict[str,
                     categories_data["Language"] = set()
                 categories_data["Language"].add(geo_focus)
         
-        # Content Types
-        content_types = db.content_types.find({"tenant": tenant_obj_id})
-        categories_data["Content Type"] = {ct["name"] for ct in content_types if ct.get("name")}
-        
-        # Topics
-        topics = db.topics.find({"tenant": tenant_obj_id})
-        categories_data["Topics"] = {topic["name"] for topic in topics if topic.get("name")}
-        
-        # Custom Tags
-        custom_tags = db.custom_tags.find({"tenant": tenant_obj_id})
-        categories_data["Custom Tags"] = {tag["name"] for tag in custom_tags if tag.get("name")}
+        # Content Types, Topics, Custom Tags - de-duplicated server-side
+        named_filter = {"tenant": tenant_obj_id, "name": {"$nin": [None, ""]}}
+        categories_data["Content Type"] = set(db.content_types.distinct("name", named_filter))
+        categories_data["Topics"] = set(db.topics.distinct("name", named_filter))
+        categories_data["Custom Tags"] = set(db.custom_tags.distinct("name", named_filter))
         
         # Convert sets to sorted lists
         categories_final = {k: sorted(list(v)) for k, v in categories_data.items() if v}
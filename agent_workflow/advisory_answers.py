@@ -1,19 +1,63 @@
 import os
+import re
+import asyncio
+import contextlib
 import json
-from openai import OpenAI
+import time
+import hashlib
+import logging
+from dataclasses import asdict
+from openai import RateLimitError, APITimeoutError, APIConnectionError, InternalServerError
+from tenacity import retry, retry_if_exception_type, wait_random_exponential, stop_after_attempt, before_sleep_log
 from dotenv import load_dotenv
-from typing import Dict, List, Any, Optional
+from openai_client import get_openai_client
+from query_parser import QueryResult, SemanticParseCache, _categories_fingerprint
+from typing import Dict, List, Any, Optional, Iterator, Tuple
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Retries are owned by LLMAdvisor._call_openai (tenacity); SDK-level retries would multiply attempts
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "0"))
+
+# MODEL_TIER lets deployments switch the advisory model without a code change
+MODEL_TIERS = {
+    "mini": "gpt-4o-mini",
+    "standard": "gpt-4o",
+    "turbo": "gpt-4-turbo",
+}
+DEFAULT_MODEL = MODEL_TIERS.get(os.getenv("MODEL_TIER", "mini").lower(), MODEL_TIERS["mini"])
+
+# Upper bound on pipelines in flight at once from the async entry points (keeps us under OpenAI rate limits)
+ASYNC_MAX_CONCURRENCY = int(os.getenv("ADVISORY_MAX_CONCURRENCY", "8"))
+
+# Query type keywords in priority order - the first type with a hit wins
+QUERY_TYPE_KEYWORDS = [
+    ('diagnostic', ['are we', 'is our', 'do we', 'should we']),
+    ('strategic', ['what should', 'how can', 'strategy', 'recommend']),
+    ('comparative', ['compare', 'versus', 'vs', 'difference']),
+    ('informational', ['show', 'list', 'find', 'get']),
+]
+_KEYWORD_PRIORITY = {
+    keyword: (priority, query_type)
+    for priority, (query_type, keywords) in enumerate(QUERY_TYPE_KEYWORDS)
+    for keyword in keywords
+}
+# One alternation inside a lookahead: matches (overlapping) substrings in a single scan
+_QUERY_TYPE_PATTERN = re.compile(
+    "(?=(" + "|".join(re.escape(keyword) for keyword in _KEYWORD_PRIORITY) + "))"
+)
+
 class LLMAdvisor:
     """
     Simple LLM advisory layer that interprets analytics results 
     and provides business intelligence based on user queries.
     """
     
-    def __init__(self, openai_api_key: str = None):
-        self.client = OpenAI(api_key=openai_api_key or os.getenv("OPENAI_API_KEY"))
+    def __init__(self, openai_api_key: str = None, model: str = None):
+        self.client = get_openai_client(openai_api_key, max_retries=OPENAI_MAX_RETRIES)
+        self.model = model or DEFAULT_MODEL
     
     def generate_advisory_response(self, 
                                  original_query: str, 
@@ -35,13 +79,11 @@ class LLMAdvisor:
             prompt = self._build_advisory_prompt(original_query, analytics_results, query_context)
             
             # Get LLM response
-            completion = self.client.chat.completions.create(
-                model="gpt-4",
+            completion = self._call_openai(
                 messages=[
                     {"role": "system", "content": self._get_system_prompt()},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7,
                 max_tokens=1000
             )
             
@@ -51,6 +93,89 @@ class LLMAdvisor:
         except Exception as e:
             return f"Error generating advisory response: {str(e)}"
     
+    def stream_advisory_response(self,
+                                 original_query: str,
+                                 analytics_results: Dict[str, Any],
+                                 query_context: Dict[str, Any]) -> Iterator[str]:
+        """
+        Same answer as generate_advisory_response, yielded as text chunks while the model writes it.
+        Errors are raised to the caller (a partial answer can't be replaced by an error message).
+        """
+        prompt = self._build_advisory_prompt(original_query, analytics_results, query_context)
+        stream = self._call_openai(
+            messages=[
+                {"role": "system", "content": self._get_system_prompt()},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=1000,
+            stream=True
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    def generate_advisory_responses_multi(self, items: List[Dict[str, Any]]) -> List[str]:
+        """
+        Answer several independent queries with one LLM call.
+        
+        Args:
+            items: Dicts with original_query, analytics_results and query_context
+                   (the arguments of generate_advisory_response)
+        
+        Returns:
+            Advisory responses in the same order as items
+        """
+        if not items:
+            return []
+        
+        try:
+            sections = [
+                f"### {i}\n" + self._build_advisory_prompt(item["original_query"],
+                                                           item["analytics_results"],
+                                                           item["query_context"]).strip()
+                for i, item in enumerate(items, start=1)
+            ]
+            keys = ", ".join(f'"{i}": "..."' for i in range(1, len(items) + 1))
+            prompt = (
+                "Answer each of the following questions independently. "
+                f"Return a JSON object {{{keys}}} where each value is the full markdown answer "
+                "for the question with that number.\n\n" + "\n\n".join(sections)
+            )
+            
+            completion = self._call_openai(
+                messages=[
+                    {"role": "system", "content": self._get_system_prompt()},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"},
+                max_tokens=1000 * len(items)
+            )
+            
+            answers = json.loads(completion.choices[0].message.content)
+            return [
+                answers.get(str(i), "Error generating advisory response: missing from batched reply")
+                for i in range(1, len(items) + 1)
+            ]
+            
+        except Exception as e:
+            return [f"Error generating advisory response: {str(e)}"] * len(items)
+    
+    @retry(
+        retry=retry_if_exception_type((RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)),
+        wait=wait_random_exponential(min=1, max=30),
+        stop=stop_after_attempt(5),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True
+    )
+    def _call_openai(self, messages: List[Dict[str, str]], **kwargs):
+        """Chat completion call, retried with jittered backoff on transient API errors (429/5xx/timeouts)"""
+        return self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=0.7,
+            **kwargs
+        )
+    
     def _build_advisory_prompt(self, 
                              original_query: str, 
                              analytics_results: Dict[str, Any], 
@@ -97,22 +222,38 @@ Response format:
 1. Direct answer to the user's question
 2. Key insights from the data
 3. Actionable recommendations
-4. Additional considerations (if relevant)"""
+4. Additional considerations (if relevant)
+
+Example 1 (diagnostic):
+User asked: "Are we too focused on TOFU content?"
+Analytics: TOFU 62 (62%), MOFU 25 (25%), BOFU 13 (13%)
+Answer:
+1. Yes - 62% of your content is TOFU, well above a balanced funnel.
+2. BOFU is thin at 13%, so few pages help readers who are ready to convert.
+3. Shift new production toward BOFU (case studies, product comparisons) until it reaches ~25%.
+4. Check whether the TOFU pages link into MOFU/BOFU content.
+
+Example 2 (strategic):
+User asked: "What should our content strategy be for investors?"
+Analytics: Individual Investors 40 pages, Financial Advisors 4 pages
+Answer:
+1. Keep serving individual investors, but open a financial advisor track.
+2. Advisors have only 4 pages against 40 for individual investors.
+3. Start with 3-5 advisor-focused resources and one webinar.
+4. Reuse the strongest investor pages as a base for advisor versions."""
     
     def _detect_query_type(self, query: str) -> str:
         """Simple query type detection for prompt customization"""
-        query_lower = query.lower()
-        
-        if any(word in query_lower for word in ['are we', 'is our', 'do we', 'should we']):
-            return 'diagnostic'
-        elif any(word in query_lower for word in ['what should', 'how can', 'strategy', 'recommend']):
-            return 'strategic'
-        elif any(word in query_lower for word in ['compare', 'versus', 'vs', 'difference']):
-            return 'comparative'
-        elif any(word in query_lower for word in ['show', 'list', 'find', 'get']):
-            return 'informational'
-        else:
-            return 'general'
+        best = None
+        
+        for match in _QUERY_TYPE_PATTERN.finditer(query.lower()):
+            priority, query_type = _KEYWORD_PRIORITY[match.group(1)]
+            if priority == 0:
+                return query_type
+            if best is None or priority < best[0]:
+                best = (priority, query_type)
+        
+        return best[1] if best else 'general'
     
     def _get_prompt_template(self, query_type: str) -> str:
         """Get appropriate prompt template based on query type"""
@@ -121,7 +262,7 @@ Response format:
             'diagnostic': """
 User asked: "{original_query}"
 
-Analytics Results:
+Analytics Results (JSON):
 {analytics_summary}
 
 Query Details:
@@ -135,7 +276,7 @@ Please analyze this data to directly answer the user's question. Provide a diagn
             'strategic': """
 User asked: "{original_query}"
 
-Analytics Results:
+Analytics Results (JSON):
 {analytics_summary}
 
 Query Details:
@@ -149,7 +290,7 @@ Based on this data, provide strategic recommendations that directly address the
             'comparative': """
 User asked: "{original_query}"
 
-Analytics Results:
+Analytics Results (JSON):
 {analytics_summary}
 
 Query Details:
@@ -163,7 +304,7 @@ Provide a comparative analysis based on the data. Highlight key differences, per
             'informational': """
 User asked: "{original_query}"
 
-Analytics Results:
+Analytics Results (JSON):
 {analytics_summary}
 
 Query Details:
@@ -177,7 +318,7 @@ Provide a clear summary of the data that answers the user's information request.
             'general': """
 User asked: "{original_query}"
 
-Analytics Results:
+Analytics Results (JSON):
 {analytics_summary}
 
 Query Details:
@@ -192,34 +333,16 @@ Please analyze this data to provide insights that address the user's question. I
         return templates.get(query_type, templates['general'])
     
     def _format_analytics_for_llm(self, analytics_results: Dict[str, Any]) -> str:
-        """Format analytics results in a clear way for LLM consumption"""
+        """Format analytics results as compact JSON (far fewer prompt tokens than prose)"""
         
-        if analytics_results.get("error"):
-            return f"Error in analytics: {analytics_results['error']}"
+        if not analytics_results:
+            return "No specific analytics data available."
         
-        formatted = []
-        
-        # Summary statistics
-        if "summary" in analytics_results:
-            formatted.append("Summary Statistics:")
-            for field, stats in analytics_results["summary"].items():
-                if isinstance(stats, dict) and "count" in stats:
-                    formatted.append(f"  - {field}: {stats['count']} items, avg: {stats.get('average', 'N/A')}, total: {stats.get('sum', 'N/A')}")
-        
-        # Distribution analysis
         if "distribution" in analytics_results:
-            formatted.append(f"\nDistribution by {analytics_results.get('group_by_field', 'category')}:")
-            for item in analytics_results["distribution"][:10]:  # Top 10 items
-                formatted.append(f"  - {item['category']}: {item['value']} ({item['percentage']}%)")
-        
-        # Meta information
-        if analytics_results.get("total_documents"):
-            formatted.append(f"\nTotal documents analyzed: {analytics_results['total_documents']}")
+            # Top 10 items are enough context for the advisor
+            analytics_results = {**analytics_results, "distribution": analytics_results["distribution"][:10]}
         
-        if analytics_results.get("unique_categories"):
-            formatted.append(f"Unique categories found: {analytics_results['unique_categories']}")
-        
-        return "\n".join(formatted) if formatted else "No specific analytics data available."
+        return json.dumps(analytics_results, separators=(",", ":"), default=str)
     
     def _format_filters(self, filters: Dict[str, List[str]]) -> str:
         """Format filters for display in prompt"""
@@ -234,10 +357,181 @@ Please analyze this data to provide insights that address the user's question. I
         return "; ".join(filter_strs) if filter_strs else "None"
 
 
+# Canned reply for data-backed queries that match nothing - no LLM call needed
+_EMPTY_RESPONSE_TEMPLATE = """No matching content was found for: "{query}"
+
+There is no data to analyze for this question with the current filters. Try:
+- Removing or broadening some of the filters
+- Checking the category values (e.g. "TOFU", "Product Page")
+- Asking a broader question, such as "What is our funnel stage distribution?"
+"""
+
+
+class AdvisoryResponseCache:
+    """
+    Two-tier cache of complete advisory responses, per tenant.
+    
+    Exact tier: blake2b of the normalized query in the response_cache collection (shared by
+    every process, expired by a TTL index). Semantic tier: in-process embedding match for
+    rephrasings, with the same guards as the parse cache (same categories, same category
+    values mentioned). Both tiers ignore entries older than ttl_seconds.
+    """
+    
+    def __init__(self, mongo_db=None, ttl_seconds: int = 3600, semantic_cache: Optional[SemanticParseCache] = None):
+        self.collection = mongo_db["response_cache"] if mongo_db is not None else None
+        self.ttl_seconds = ttl_seconds
+        self.semantic_cache = semantic_cache or SemanticParseCache()
+    
+    def ensure_indexes(self):
+        """Lookup index plus a TTL index so Mongo drops stale answers on its own (idempotent)"""
+        if self.collection is None:
+            return
+        try:
+            self.collection.create_index([("tenant_id", 1), ("query_hash", 1)], unique=True)
+            self.collection.create_index("created_at", expireAfterSeconds=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Error creating response cache indexes: {e}")
+    
+    @staticmethod
+    def normalize_query(query_text: str) -> str:
+        """Case, punctuation and whitespace don't change the answer"""
+        return " ".join(re.sub(r"[^\w\s]", " ", query_text.lower()).split())
+    
+    def lookup(self, tenant_id: str, query_text: str, categories: Dict[str, List[str]]):
+        """Return (cached response or None, query embedding) - the embedding is reused by add()"""
+        normalized = self.normalize_query(query_text)
+        
+        if self.collection is not None:
+            try:
+                doc = self.collection.find_one(
+                    {"tenant_id": tenant_id, "query_hash": self._hash(normalized)},
+                    {"_id": 0, "payload": 1, "created_at": 1}
+                )
+                if doc and self._is_fresh(doc["created_at"]):
+                    return self._load(doc["payload"]), None
+            except Exception as e:
+                logger.warning(f"Response cache lookup failed: {e}")
+        
+        cached, embedding = self.semantic_cache.lookup(normalized, categories, self._fingerprint(tenant_id, categories))
+        if cached is not None and self._is_fresh(cached["created_at"]):
+            return self._load(cached["payload"]), embedding
+        return None, embedding
+    
+    def add(self, tenant_id: str, query_text: str, categories: Dict[str, List[str]], embedding, response: Dict[str, Any]):
+        normalized = self.normalize_query(query_text)
+        entry = {"payload": self._dump(response), "created_at": time.time()}
+        
+        if self.collection is not None:
+            try:
+                self.collection.update_one(
+                    {"tenant_id": tenant_id, "query_hash": self._hash(normalized)},
+                    {"$set": entry},
+                    upsert=True
+                )
+            except Exception as e:
+                logger.warning(f"Response cache write failed: {e}")
+        
+        self.semantic_cache.add(normalized, categories, self._fingerprint(tenant_id, categories), embedding, entry)
+    
+    def _is_fresh(self, created_at: float) -> bool:
+        return time.time() - created_at < self.ttl_seconds
+    
+    @staticmethod
+    def _hash(normalized_query: str) -> str:
+        return hashlib.blake2b(normalized_query.encode(), digest_size=16).hexdigest()
+    
+    @staticmethod
+    def _fingerprint(tenant_id: str, categories: Dict[str, List[str]]) -> str:
+        # Prefixed so entries never collide with parse results when the semantic cache is shared with a parser
+        return f"response:{tenant_id}:{_categories_fingerprint(categories)}"
+    
+    @staticmethod
+    def _dump(response: Dict[str, Any]) -> str:
+        """Responses hold a QueryResult and numpy/ObjectId values - store them as JSON text"""
+        response = {**response, "parsed_result": asdict(response["parsed_result"])}
+        # numpy scalars keep their number type; anything else (ObjectId, datetime) becomes its string form
+        return json.dumps(response, default=lambda value: value.item() if hasattr(value, "item") else str(value))
+    
+    @staticmethod
+    def _load(payload: str) -> Dict[str, Any]:
+        response = json.loads(payload)
+        response["parsed_result"] = QueryResult(**response["parsed_result"])
+        response["cached"] = True
+        return response
+
+
 # Factory function
-def create_llm_advisor(openai_api_key: str = None) -> LLMAdvisor:
+def create_llm_advisor(openai_api_key: str = None, model: str = None) -> LLMAdvisor:
     """Factory function to create LLM advisor instance"""
-    return LLMAdvisor(openai_api_key)
+    return LLMAdvisor(openai_api_key, model)
+
+
+def _collect_analytics(query_text: str,
+                       tenant_id: str,
+                       query_parser,
+                       query_builder,
+                       analytics_engine,
+                       mongo_db) -> Dict[str, Any]:
+    """
+    Parse → Build Query → Execute → Analyze for one query.
+    
+    Returns the partial response; "query_context" is set when the query still
+    needs an advisory answer from the LLM.
+    """
+    # Step 1: Parse query
+    parsed_result = query_parser.parse(query_text, tenant_id)
+    
+    # Step 2: Build and execute database query if needed
+    database_results = []
+    analytics_results = {}
+    
+    if query_parser.should_use_database(parsed_result):
+        query_params = query_parser.get_database_query_params(parsed_result)
+        mongo_query = query_builder.build_query(query_params)
+        
+        if parsed_result.operation == "list":
+            # Page, total count and numeric summary come back from one $facet round trip
+            faceted = query_builder.execute_list_with_stats(mongo_db, mongo_query)
+            database_results = faceted["data"] if faceted else []
+            if database_results:
+                analytics_results = faceted["stats"]
+        else:
+            database_results = query_builder.execute_query(mongo_db, mongo_query)
+        
+        # Step 3: Analyze the data
+        if database_results:
+            # Auto-analyze based on operation type
+            if parsed_result.operation in ['aggregate', 'insight']:
+                # For aggregated data, analyze the distribution
+                analytics_results = analytics_engine.analyze_distribution(database_results, "_id", "count")
+            elif not analytics_results:
+                # For raw documents, get summary stats
+                analytics_results = analytics_engine.calculate_summary_stats(database_results)
+        else:
+            # Nothing to analyze - skip the LLM round trip
+            return {
+                "query": query_text,
+                "parsed_result": parsed_result,
+                "data_found": 0,
+                "analytics": {},
+                "advisory_response": _EMPTY_RESPONSE_TEMPLATE.format(query=query_text),
+                "success": True
+            }
+    
+    return {
+        "query": query_text,
+        "parsed_result": parsed_result,
+        "data_found": analytics_results.get("total_documents", len(database_results)) if database_results else 0,
+        "analytics": analytics_results,
+        "raw_data": database_results or [],
+        "query_context": {
+            "operation": parsed_result.operation,
+            "filters": parsed_result.filters,
+            "route": parsed_result.route,
+            "tenant_id": tenant_id
+        },
+        "success": True
+    }
 
 
 # Integration function to tie everything together
@@ -247,9 +541,12 @@ def get_complete_advisory_response(query_text: str,
                                  query_builder, 
                                  analytics_engine,
                                  mongo_db,
-                                 llm_advisor: LLMAdvisor) -> Dict[str, Any]:
+                                 llm_advisor: LLMAdvisor,
+                                 response_cache: Optional[AdvisoryResponseCache] = None,
+                                 cache_bypass: bool = False) -> Dict[str, Any]:
     """
     Complete pipeline: Parse → Build Query → Execute → Analyze → Advise
+    (skipped entirely when the same - or a rephrased - question was answered recently)
     
     Args:
         query_text: User's question
@@ -259,62 +556,186 @@ def get_complete_advisory_response(query_text: str,
         analytics_engine: AnalyticsEngine instance
         mongo_db: MongoDB database connection
         llm_advisor: LLMAdvisor instance
+        response_cache: Optional AdvisoryResponseCache
+        cache_bypass: Recompute (and refresh the cache) even if a cached answer exists
     
     Returns:
         Complete response with data and advisory
     """
     try:
-        # Step 1: Parse query
-        parsed_result = query_parser.parse(query_text, tenant_id)
-        
-        # Step 2: Build and execute database query if needed
-        database_results = []
-        analytics_results = {}
+        embedding = None
+        if response_cache is not None:
+            categories = query_parser.schema_util.get_tenant_schema(tenant_id).categories
+            if not cache_bypass:
+                cached, embedding = response_cache.lookup(tenant_id, query_text, categories)
+                if cached is not None:
+                    return cached
         
-        if query_parser.should_use_database(parsed_result):
-            query_params = query_parser.get_database_query_params(parsed_result)
-            mongo_query = query_builder.build_query(query_params)
-            database_results = query_builder.execute_query(mongo_db, mongo_query)
-            
-            # Step 3: Analyze the data
-            if database_results:
-                # Auto-analyze based on operation type
-                if parsed_result.operation in ['aggregate', 'insight']:
-                    # For aggregated data, analyze the distribution
-                    analytics_results = analytics_engine.analyze_distribution(database_results, "_id", "count")
-                else:
-                    # For raw documents, get summary stats
-                    analytics_results = analytics_engine.calculate_summary_stats(database_results)
+        response = _collect_analytics(query_text, tenant_id, query_parser,
+                                      query_builder, analytics_engine, mongo_db)
         
         # Step 4: Generate advisory response
-        query_context = {
-            "operation": parsed_result.operation,
-            "filters": parsed_result.filters,
-            "route": parsed_result.route,
-            "tenant_id": tenant_id
-        }
+        query_context = response.pop("query_context", None)
+        if query_context is not None:
+            response["advisory_response"] = llm_advisor.generate_advisory_response(
+                original_query=query_text,
+                analytics_results=response["analytics"],
+                query_context=query_context
+            )
         
-        advisory_response = llm_advisor.generate_advisory_response(
-            original_query=query_text,
-            analytics_results=analytics_results,
-            query_context=query_context
-        )
+        if response_cache is not None and not response["advisory_response"].startswith("Error generating"):
+            response_cache.add(tenant_id, query_text, categories, embedding, response)
+        
+        return response
         
+    except Exception as e:
         return {
             "query": query_text,
-            "parsed_result": parsed_result,
-            "data_found": len(database_results) if database_results else 0,
-            "analytics": analytics_results,
-            "advisory_response": advisory_response,
-            "success": True
+            "error": str(e),
+            "success": False
         }
+
+
+def stream_complete_advisory_response(query_text: str,
+                                      tenant_id: str,
+                                      query_parser,
+                                      query_builder,
+                                      analytics_engine,
+                                      mongo_db,
+                                      llm_advisor: LLMAdvisor,
+                                      response_cache: Optional[AdvisoryResponseCache] = None,
+                                      cache_bypass: bool = False) -> Tuple[Dict[str, Any], Optional[Iterator[str]]]:
+    """
+    Same pipeline as get_complete_advisory_response, but the advisory step is handed back as a
+    stream of text chunks (e.g. for st.write_stream) so the answer shows while it is generated.
+    
+    Returns:
+        (response, chunks) - chunks is None when no LLM call is needed (cached answer, no data,
+        or an error); otherwise response["advisory_response"] is filled in once chunks is exhausted
+    """
+    try:
+        embedding = None
+        if response_cache is not None:
+            categories = query_parser.schema_util.get_tenant_schema(tenant_id).categories
+            if not cache_bypass:
+                cached, embedding = response_cache.lookup(tenant_id, query_text, categories)
+                if cached is not None:
+                    return cached, None
+        
+        response = _collect_analytics(query_text, tenant_id, query_parser,
+                                      query_builder, analytics_engine, mongo_db)
+        query_context = response.pop("query_context", None)
+        if query_context is None:
+            if response_cache is not None:
+                response_cache.add(tenant_id, query_text, categories, embedding, response)
+            return response, None
         
     except Exception as e:
         return {
             "query": query_text,
             "error": str(e),
             "success": False
-        }
+        }, None
+    
+    response["advisory_response"] = ""
+    
+    def chunks() -> Iterator[str]:
+        parts = []
+        try:
+            for part in llm_advisor.stream_advisory_response(query_text, response["analytics"], query_context):
+                parts.append(part)
+                yield part
+        except Exception as e:
+            error = f"Error generating advisory response: {str(e)}"
+            response["advisory_response"] = "".join(parts) + error
+            yield error
+            return
+        
+        response["advisory_response"] = "".join(parts)
+        if response_cache is not None:
+            response_cache.add(tenant_id, query_text, categories, embedding, response)
+    
+    return response, chunks()
+
+
+async def aget_complete_advisory_response(query_text: str,
+                                          tenant_id: str,
+                                          query_parser,
+                                          query_builder,
+                                          analytics_engine,
+                                          mongo_db,
+                                          llm_advisor: LLMAdvisor,
+                                          semaphore: Optional[asyncio.Semaphore] = None) -> Dict[str, Any]:
+    """
+    Async variant of get_complete_advisory_response.
+    
+    The parse/query/advise steps depend on each other, so a single query still runs them
+    in order - the blocking Mongo and OpenAI work runs in a worker thread so the event loop
+    stays free, and several queries can be awaited together (see agather_advisory_responses).
+    """
+    async with semaphore or contextlib.nullcontext():
+        return await asyncio.to_thread(get_complete_advisory_response, query_text, tenant_id, query_parser,
+                                       query_builder, analytics_engine, mongo_db, llm_advisor)
+
+
+async def agather_advisory_responses(queries: List[str],
+                                     tenant_id: str,
+                                     query_parser,
+                                     query_builder,
+                                     analytics_engine,
+                                     mongo_db,
+                                     llm_advisor: LLMAdvisor,
+                                     max_concurrency: int = ASYNC_MAX_CONCURRENCY) -> List[Dict[str, Any]]:
+    """
+    Run the complete pipeline for several independent queries concurrently.
+    
+    Returns:
+        One response per query, in input order (same shape as get_complete_advisory_response)
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    return await asyncio.gather(*(
+        aget_complete_advisory_response(query_text, tenant_id, query_parser, query_builder,
+                                        analytics_engine, mongo_db, llm_advisor, semaphore)
+        for query_text in queries
+    ))
+
+
+def run_many(queries: List[str],
+             tenant_id: str,
+             query_parser,
+             query_builder,
+             analytics_engine,
+             mongo_db,
+             llm_advisor: LLMAdvisor) -> List[Dict[str, Any]]:
+    """
+    Run the complete pipeline for several independent queries, answering all
+    of them with a single batched LLM call.
+    
+    Returns:
+        One response per query, in input order (same shape as get_complete_advisory_response)
+    """
+    responses = []
+    for query_text in queries:
+        try:
+            responses.append(_collect_analytics(query_text, tenant_id, query_parser,
+                                                query_builder, analytics_engine, mongo_db))
+        except Exception as e:
+            responses.append({"query": query_text, "error": str(e), "success": False})
+    
+    pending = [response for response in responses if "query_context" in response]
+    if pending:
+        answers = llm_advisor.generate_advisory_responses_multi([
+            {
+                "original_query": response["query"],
+                "analytics_results": response["analytics"],
+                "query_context": response.pop("query_context")
+            }
+            for response in pending
+        ])
+        for response, answer in zip(pending, answers):
+            response["advisory_response"] = answer
+    
+    return responses
 
 
 # Example usage
@@ -324,6 +745,7 @@ if __name__ == "__main__":
     from schema_extractor import create_schema_util
     from analytics_engine import create_analytics_engine
     from pymongo import MongoClient
+    from concurrent.futures import ThreadPoolExecutor, as_completed
     
     # Initialize all components
     client = MongoClient("mongodb://localhost:27017")
@@ -345,23 +767,32 @@ if __name__ == "__main__":
     
     tenant_id = "6875f3afc8337606d54a7f37"
     
-    for query in test_queries:
-        print(f"\n{'='*50}")
-        print(f"Query: {query}")
-        print('='*50)
-        
-        response = get_complete_advisory_response(
-            query_text=query,
-            tenant_id=tenant_id,
-            query_parser=query_parser,
-            query_builder=query_builder,
-            analytics_engine=analytics_engine,
-            mongo_db=mongo_db,
-            llm_advisor=llm_advisor
-        )
+    # Each pipeline is I/O bound (Mongo + OpenAI), so threads overlap the waits
+    with ThreadPoolExecutor(max_workers=len(test_queries)) as executor:
+        futures = {
+            executor.submit(
+                get_complete_advisory_response,
+                query_text=query,
+                tenant_id=tenant_id,
+                query_parser=query_parser,
+                query_builder=query_builder,
+                analytics_engine=analytics_engine,
+                mongo_db=mongo_db,
+                llm_advisor=llm_advisor
+            ): query
+            for query in test_queries
+        }
         
-        if response["success"]:
-            print(f"Data Found: {response['data_found']} documents")
-            print(f"Advisory Response:\n{response['advisory_response']}")
-        else:
-            print(f"Error: {response['error']}")
\ No newline at end of file
+        for future in as_completed(futures):
+            query = futures[future]
+            response = future.result()
+            
+            print(f"\n{'='*50}")
+            print(f"Query: {query}")
+            print('='*50)
+            
+            if response["success"]:
+                print(f"Data Found: {response['data_found']} documents")
+                print(f"Advisory Response:\n{response['advisory_response']}")
+            else:
+                print(f"Error: {response['error']}")
\ No newline at end of file
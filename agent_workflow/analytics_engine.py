@@ -1,6 +1,29 @@
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Callable
 import logging
-from collections import Counter, defaultdict
+import math
+from collections import Counter
+import numpy as np
+from functools import lru_cache
+
+
+@lru_cache(maxsize=256)
+def _make_accessor(field: str) -> Callable[[Dict], Any]:
+    """Build a getter for a (possibly dotted) field once, so the per-doc path skips split/parse"""
+    if '.' not in field:
+        return lambda doc: doc.get(field)
+    
+    keys = tuple(field.split('.'))
+    
+    def accessor(doc: Dict) -> Any:
+        value = doc
+        for key in keys:
+            if isinstance(value, dict) and key in value:
+                value = value[key]
+            else:
+                return None
+        return value
+    
+    return accessor
 
 class AnalyticsEngine:
     """
@@ -33,17 +56,33 @@ class AnalyticsEngine:
                 "summary": {}
             }
             
+            # Single pass over the data: running count/sum/min/max per field
+            accessors = [(field, _make_accessor(field)) for field in fields]
+            running = {field: [0, 0, math.inf, -math.inf] for field in fields}
+            
+            for doc in data:
+                for field, accessor in accessors:
+                    value = accessor(doc)
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        acc = running[field]
+                        acc[0] += 1
+                        acc[1] += value
+                        if value < acc[2]:
+                            acc[2] = value
+                        if value > acc[3]:
+                            acc[3] = value
+            
             for field in fields:
-                field_values = self._extract_field_values(data, field)
+                count, total, minimum, maximum = running[field]
                 
-                if field_values:
+                if count:
                     stats["summary"][field] = {
-                        "count": len(field_values),
-                        "sum": sum(field_values),
-                        "average": sum(field_values) / len(field_values),
-                        "min": min(field_values),
-                        "max": max(field_values),
-                        "non_null_percentage": (len(field_values) / len(data)) * 100
+                        "count": count,
+                        "sum": total,
+                        "average": total / count,
+                        "min": minimum,
+                        "max": maximum,
+                        "non_null_percentage": (count / len(data)) * 100
                     }
                 else:
                     stats["summary"][field] = {
@@ -150,9 +189,10 @@ class AnalyticsEngine:
     def _extract_field_values(self, data: List[Dict], field: str, convert_to_string: bool = False) -> List[Any]:
         """Extract values for a specific field from all documents"""
         values = []
+        accessor = _make_accessor(field)
         
         for doc in data:
-            value = self._get_nested_field_value(doc, field)
+            value = accessor(doc)
             
             if value is not None:
                 if convert_to_string:
@@ -166,41 +206,34 @@ class AnalyticsEngine:
         return values
     
     def _get_nested_field_value(self, doc: Dict, field: str) -> Any:
-        """Get field value, handling nested fields with dot notation"""
-        if '.' not in field:
-            return doc.get(field)
-        
-        # Handle nested field access (e.g., "categoryDetails.name")
-        keys = field.split('.')
-        value = doc
-        
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return None
-        
-        return value
+        """Get field value, handling nested fields with dot notation (e.g., "categoryDetails.name")"""
+        return _make_accessor(field)(doc)
     
-    def _calculate_value_distribution(self, data: List[Dict], group_by_field: str, value_field: str) -> Dict[str, float]:
+    def _calculate_value_distribution(self, data: List[Dict], group_by_field: str, value_field: str) -> Counter:
         """Calculate distribution by summing values for each group"""
-        distribution = defaultdict(float)
+        group_accessor = _make_accessor(group_by_field)
+        value_accessor = _make_accessor(value_field)
         
+        # Pre-extract both columns once, then do the group-by sum in numpy
+        groups = []
+        values = []
         for doc in data:
-            group_value = self._get_nested_field_value(doc, group_by_field)
-            aggregate_value = self._get_nested_field_value(doc, value_field)
+            group_value = group_accessor(doc)
+            aggregate_value = value_accessor(doc)
             
             if group_value is not None and aggregate_value is not None:
-                group_key = str(group_value)
-                
-                # Handle numeric values
-                if isinstance(aggregate_value, (int, float)):
-                    distribution[group_key] += aggregate_value
-                else:
-                    # If not numeric, just count occurrences
-                    distribution[group_key] += 1
+                groups.append(str(group_value))
+                # Numeric values are summed; anything else just counts as one occurrence
+                values.append(aggregate_value if isinstance(aggregate_value, (int, float)) else 1)
+        
+        if not groups:
+            return Counter()
+        
+        categories, inverse = np.unique(np.array(groups, dtype=object), return_inverse=True)
+        sums = np.zeros(len(categories), dtype=np.float64)
+        np.add.at(sums, inverse, np.asarray(values, dtype=np.float64))
         
-        return dict(distribution)
+        return Counter(dict(zip(categories.tolist(), sums.tolist())))
 
 
 # Factory function
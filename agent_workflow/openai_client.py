@@ -0,0 +1,35 @@
+import os
+import threading
+import httpx
+from openai import OpenAI
+from typing import Dict, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Same default as the OpenAI SDK - callers that retry themselves (LLMAdvisor) pass 0
+SDK_DEFAULT_MAX_RETRIES = 2
+
+# Shared clients (one per API key / retry setting) so every component reuses one keep-alive connection pool
+_clients: Dict[Tuple[Optional[str], int], OpenAI] = {}
+_clients_lock = threading.Lock()
+
+
+def get_openai_client(api_key: Optional[str] = None, max_retries: int = SDK_DEFAULT_MAX_RETRIES) -> OpenAI:
+    """Return the shared OpenAI client for this key, creating it on first use"""
+    key = (api_key or os.getenv("OPENAI_API_KEY"), max_retries)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = OpenAI(
+                    api_key=key[0],
+                    max_retries=max_retries,
+                    http_client=httpx.Client(
+                        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                        timeout=30.0
+                    )
+                )
+                _clients[key] = client
+    return client
@@ -1,9 +1,12 @@
-import os
+import re
 import json
 from openai import OpenAI
-from bson import ObjectId
-from typing import Dict, List, Any, Optional
+from openai_client import get_openai_client
+from bson import ObjectId, Regex
+from pymongo.errors import OperationFailure
+from typing import Dict, List, Any, Optional, Iterator
 from dotenv import load_dotenv
+from schema_extractor import to_object_id
 
 """
 now it should have only 3 functions 
@@ -14,9 +17,42 @@ now it should have only 3 functions
 load_dotenv()
 
 class MongoQueryBuilder:
+    # Categories backed by their own collections rather than category_attributes - can't become attribute filters
+    NON_ATTRIBUTE_CATEGORIES = {"Topics", "Content Types", "Custom Tags"}
+    
+    # Fields the list views actually use - shipped instead of full sitemap documents
+    SITEMAP_PROJECTION = {
+        "_id": 1,
+        "name": 1,
+        "fullUrl": 1,
+        "description": 1,
+        "createdAt": 1,
+        "wordCount": 1
+    }
+    
+    # Text fields the semantic fallback matches against, and how many terms it expands into $or clauses
+    SEMANTIC_FIELDS = ("name", "description", "summary")
+    MAX_REGEX_TERMS = 8
+    
+    # Numeric sitemap fields summarized server-side alongside list pages
+    LIST_STAT_FIELDS = ("wordCount",)
+    
+    # Default page size for list queries (group results are never truncated unless a limit is asked for)
+    DEFAULT_LIST_LIMIT = 50
+    
+    # Cursor batch size for list pipelines - the first page comes back without draining the whole result
+    LIST_BATCH_SIZE = 50
+    
     def __init__(self, tenant_schema_util, openai_api_key: str = None):
         self.schema_util = tenant_schema_util
-        self.client = OpenAI(api_key=openai_api_key or os.getenv("OPENAI_API_KEY"))
+        self._openai_api_key = openai_api_key
+        # Hints name specific indexes - only attach them once ensure_indexes() has built them
+        self._indexes_ready = False
+    
+    @property
+    def client(self) -> OpenAI:
+        """Shared OpenAI client, resolved on first use (no connection pool is built until a call needs it)"""
+        return get_openai_client(self._openai_api_key)
     
     def build_query(self, query_params: Dict) -> Dict:
         """Build MongoDB query from parser results"""
@@ -25,6 +61,8 @@ class MongoQueryBuilder:
         operation = query_params["operation"]
         filters = query_params.get("filters", {})
         semantic_terms = query_params.get("semantic_terms", [])
+        limit = query_params.get("limit")
+        skip = query_params.get("skip", 0)
         
         # Get tenant schema for reference
         schema = self.schema_util.get_tenant_schema(tenant_id)
@@ -33,100 +71,146 @@ class MongoQueryBuilder:
         
         # Route to appropriate query builder
         if operation == "list":
-            return self._build_list_query(tenant_id, filters, semantic_terms)
+            return self._build_list_query(tenant_id, filters, semantic_terms, schema.categories,
+                                          skip=skip, limit=limit or self.DEFAULT_LIST_LIMIT)
         elif operation == "count":
             return self._build_count_query(tenant_id, filters)
         elif operation == "aggregate":
-            return self._build_aggregate_query(tenant_id, filters, schema.categories)
+            return self._build_aggregate_query(tenant_id, filters, schema.categories, skip=skip, limit=limit)
         elif operation == "insight":
-            return self._build_insight_query(tenant_id, filters, schema.categories)
+            return self._build_insight_query(tenant_id, filters, schema.categories, skip=skip, limit=limit)
         else:
             raise ValueError(f"Unknown operation: {operation}")
     
-    def _build_list_query(self, tenant_id: str, filters: Dict, semantic_terms: List[str]) -> Dict:
+    def _build_list_query(self, tenant_id: str, filters: Dict, semantic_terms: List[str],
+                          categories: Optional[Dict[str, List[str]]] = None,
+                          skip: int = 0, limit: int = DEFAULT_LIST_LIMIT) -> Dict:
         """Build query to list/retrieve content"""
         
-        pipeline = [
-            {"$match": {"tenant": ObjectId(tenant_id)}}
-        ]
+        # Terms that are really category values become exact (indexed) filters instead of regexes
+        if semantic_terms and categories:
+            filters, semantic_terms = self._promote_category_terms(filters, semantic_terms, categories)
         
-        # Add category filtering if needed
-        if filters:
-            category_stages = self._build_category_filters(tenant_id, filters)
-            pipeline.extend(category_stages)
-        
-        # Add semantic search if needed
-        if semantic_terms:
-            semantic_condition = {
-                "$or": [
-                    {"name": {"$regex": "|".join(semantic_terms), "$options": "i"}},
-                    {"description": {"$regex": "|".join(semantic_terms), "$options": "i"}},
-                    {"summary": {"$regex": "|".join(semantic_terms), "$options": "i"}}
-                ]
+        base_match = {"tenant": to_object_id(tenant_id), **self._build_category_filters(tenant_id, filters)}
+        
+        if not semantic_terms:
+            return {
+                "collection": "sitemaps",
+                "operation": "aggregate",
+                "pipeline": self._list_pipeline(base_match, skip=skip, limit=limit),
+                "hint": self._tenant_index_hint(base_match, sorted_by_date=True),
+                "batch_size": self.LIST_BATCH_SIZE
             }
-            pipeline.append({"$match": semantic_condition})
         
-        # Add final stages
-        pipeline.extend([
-            {"$sort": {"createdAt": -1}},
-            {"$limit": 300},
-            {"$project": {
-                "_id": 1,
-                "name": 1,
-                "fullUrl": 1,
-                "description": 1,
-                "createdAt": 1,
-                "wordCount": 1
-            }}
-        ])
+        # Semantic search goes through the sitemaps text index ($text must sit in the first $match)
+        text_match = {
+            **base_match,
+            "$text": {"$search": " ".join(semantic_terms), "$caseSensitive": False}
+        }
+        
+        # Fallback for deployments without a text index: one prefix-anchored clause per (term, field),
+        # never a long "|" alternation, so each $or branch can be planned on its own
+        # (bson.Regex is sent as a native BSON regex - no Python-side re compilation or flag translation)
+        regex_conditions = []
+        for term in semantic_terms[:self.MAX_REGEX_TERMS]:
+            pattern = Regex("^" + re.escape(term), "i")
+            regex_conditions.extend({field: pattern} for field in self.SEMANTIC_FIELDS)
+        regex_match = {**base_match, "$or": regex_conditions}
         
         return {
             "collection": "sitemaps",
             "operation": "aggregate",
-            "pipeline": pipeline
+            "pipeline": self._list_pipeline(text_match, text_score=True, skip=skip, limit=limit),  # $text picks its own index - no hint
+            "fallback_pipeline": self._list_pipeline(regex_match, skip=skip, limit=limit),
+            "fallback_hint": self._tenant_index_hint(base_match, sorted_by_date=True),
+            "batch_size": self.LIST_BATCH_SIZE
         }
     
-    def _build_count_query(self, tenant_id: str, filters: Dict) -> Dict:
-        """Build query to count documents"""
+    def _list_pipeline(self, match: Dict, text_score: bool = False,
+                       skip: int = 0, limit: int = DEFAULT_LIST_LIMIT) -> List[Dict]:
+        """Assemble the list pipeline: match → sort → skip → limit → project"""
+        projection = dict(self.SITEMAP_PROJECTION)
+        sort = {"createdAt": -1}
+        if text_score:
+            projection["score"] = {"$meta": "textScore"}
+            sort = {"score": {"$meta": "textScore"}, "createdAt": -1}
         
-        if not filters:
-            # Simple count with just tenant filter
-            return {
-                "collection": "sitemaps",
-                "operation": "count_documents",
-                "filter": {"tenant": ObjectId(tenant_id)}
-            }
-        
-        # For filtered counts, we need aggregation pipeline
-        pipeline = [
-            {"$match": {"tenant": ObjectId(tenant_id)}}
+        return [
+            {"$match": match},
+            {"$sort": sort},
+            *self._page_stages(skip, limit),
+            {"$project": projection}
         ]
+    
+    def _page_stages(self, skip: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """$skip/$limit stages for a page, placed right after $sort so they ride the sorted index scan"""
+        stages = []
+        if skip:
+            stages.append({"$skip": skip})
+        if limit:
+            stages.append({"$limit": limit})
+        return stages
+    
+    def _tenant_index_hint(self, match: Dict, sorted_by_date: bool = False) -> Optional[List[tuple]]:
+        """
+        Index to force for a tenant-scoped match (the planner can otherwise pick the text/createdAt index).
+        None until ensure_indexes() has succeeded on this builder - hinting a missing index fails the query.
+        """
+        if not self._indexes_ready:
+            return None
+        if "categoryAttribute" in match or "$and" in match:
+            if sorted_by_date:
+                # Filter and newest-first order both come from the index - no in-memory sort of the matches
+                return [("tenant", 1), ("categoryAttribute", 1), ("createdAt", -1)]
+            return [("tenant", 1), ("categoryAttribute", 1)]
+        if sorted_by_date:
+            return [("tenant", 1), ("createdAt", -1)]
+        return [("tenant", 1)]
+    
+    def _promote_category_terms(self, filters: Dict, semantic_terms: List[str],
+                                categories: Dict[str, List[str]]) -> tuple:
+        """Split semantic terms into category filters (exact value matches) and residual free-text terms"""
+        value_lookup = {}
+        for category_name, values in categories.items():
+            if category_name in self.NON_ATTRIBUTE_CATEGORIES:
+                continue
+            for value in values:
+                value_lookup.setdefault(value.lower(), (category_name, value))
         
-        # Add category filtering stages
-        category_stages = self._build_category_filters(tenant_id, filters)
-        pipeline.extend(category_stages)
+        promoted = {category_name: list(values) for category_name, values in (filters or {}).items()}
+        residual_terms = []
+        for term in semantic_terms:
+            match = value_lookup.get(term.strip().lower())
+            if match:
+                category_name, value = match
+                category_values = promoted.setdefault(category_name, [])
+                if value not in category_values:
+                    category_values.append(value)
+            else:
+                residual_terms.append(term)
         
-        # Add count stage
-        pipeline.append({"$count": "total"})
+        return promoted, residual_terms
+    
+    def _build_count_query(self, tenant_id: str, filters: Dict) -> Dict:
+        """Build query to count documents"""
         
+        # Category filters are a plain field condition, so even filtered counts are a count_documents
+        match = {"tenant": to_object_id(tenant_id), **self._build_category_filters(tenant_id, filters)}
         return {
             "collection": "sitemaps",
-            "operation": "aggregate",
-            "pipeline": pipeline
+            "operation": "count_documents",
+            "filter": match,
+            "hint": self._tenant_index_hint(match)
         }
     
-    def _build_aggregate_query(self, tenant_id: str, filters: Dict, categories: Dict) -> Dict:
+    def _build_aggregate_query(self, tenant_id: str, filters: Dict, categories: Dict,
+                               skip: int = 0, limit: Optional[int] = None) -> Dict:
         """Build aggregation query for grouping/analysis"""
         
-        base_match = {"tenant": ObjectId(tenant_id)}
-        
-        # Add category filters
-        if filters:
-            category_conditions = self._build_category_filters(tenant_id, filters)
-            base_match.update(category_conditions)
-        
+        # Add category filters to the leading $match
+        match = {"tenant": to_object_id(tenant_id), **self._build_category_filters(tenant_id, filters)}
         pipeline = [
-            {"$match": base_match}
+            {"$match": match}
         ]
         
         # Group by main categories (this could be enhanced with LLM)
@@ -141,28 +225,28 @@ class MongoQueryBuilder:
         pipeline.extend([
             group_stage,
             {"$sort": {"count": -1}},
-            {"$limit": 300}
+            *self._page_stages(skip, limit)
         ])
         
         return {
             "collection": "sitemaps", 
             "operation": "aggregate",
-            "pipeline": pipeline
+            "pipeline": pipeline,
+            "hint": self._tenant_index_hint(match)
         }
     
-    def _build_insight_query(self, tenant_id: str, filters: Dict, categories: Dict) -> Dict:
+    def _build_insight_query(self, tenant_id: str, filters: Dict, categories: Dict,
+                             skip: int = 0, limit: Optional[int] = None) -> Dict:
         """Build query for advisory insights - get broad data for analysis"""
         
-        base_match = {"tenant": ObjectId(tenant_id)}
-        
         # For insights, we want broader data unless specific filters provided
-        if filters:
-            category_conditions = self._build_category_filters(tenant_id, filters)
-            base_match.update(category_conditions)
+        match = {"tenant": to_object_id(tenant_id), **self._build_category_filters(tenant_id, filters)}
+        pipeline = [
+            {"$match": match}
+        ]
         
         # Get aggregated data for insight generation
-        pipeline = [
-            {"$match": base_match},
+        pipeline.extend([
             {"$group": {
                 "_id": "$categoryAttribute",
                 "count": {"$sum": 1},
@@ -170,72 +254,96 @@ class MongoQueryBuilder:
                 "avg_words": {"$avg": "$wordCount"}
             }},
             {"$sort": {"count": -1}},
-            {"$limit": 300}
-        ]
+            *self._page_stages(skip, limit)
+        ])
         
         return {
             "collection": "sitemaps",
             "operation": "aggregate", 
             "pipeline": pipeline,
+            "hint": self._tenant_index_hint(match),
             "insight_context": {
                 "categories": categories,
                 "filters_applied": filters
             }
         }
     
-    def _build_category_filters(self, tenant_id: str, filters: Dict) -> List[Dict]:
-        
+    def _build_category_filters(self, tenant_id: str, filters: Dict) -> Dict:
+        """
+        Resolve filter values to category_attributes ObjectIds up front and return the
+        sitemaps.categoryAttribute condition to merge into the leading tenant $match
+        (served by the (tenant, categoryAttribute) index - no $lookup needed).
+        Values within a category are OR'd; separate categories are AND'd, one $in per category.
+        """
         if not filters:
-            return []
-        
-        # Build pipeline stages for category filtering
-        pipeline_stages = []
-        
-        # Add lookup to get category details
-        pipeline_stages.append({
-            "$lookup": {
-                "from": "category_attributes",
-                "localField": "categoryAttribute", 
-                "foreignField": "_id",
-                "as": "categoryDetails"
-            }
-        })
+            return {}
+        
+        # Get the category ObjectIds for all filtered names in one query
+        category_ids = self._get_category_ids(tenant_id, [name for name, values in filters.items() if values])
         
-        # Build match conditions for each filter
-        match_conditions = []
+        # Build one condition per filtered category
+        attribute_conditions = []
         for category_name, values in filters.items():
-            if values:
-                # First get the category ObjectId for this category name
-                category_id = self._get_category_id(tenant_id, category_name)
-                if category_id:
-                    match_conditions.append({
-                        "$and": [
-                            {"categoryDetails.category": category_id},
-                            {"categoryDetails.name": {"$in": values}}
-                        ]
-                    })
-        
-        if match_conditions:
-            pipeline_stages.append({
-                "$match": {
-                    "$or": match_conditions
-                }
-            })
+            category_id = category_ids.get(category_name)
+            if values and category_id:
+                attribute_conditions.append({"category": category_id, "name": {"$in": values}})
+        
+        if not attribute_conditions:
+            return {}
+        
+        # Single round trip for all attribute ids, grouped back by category
+        # (a filtered category with no matching attributes keeps an empty $in - it matches nothing)
+        attribute_ids = {condition["category"]: [] for condition in attribute_conditions}
+        try:
+            for doc in self.schema_util.db.category_attributes.find(
+                {"tenant": to_object_id(tenant_id), "$or": attribute_conditions},
+                {"_id": 1, "category": 1}
+            ):
+                attribute_ids[doc["category"]].append(doc["_id"])
+        except Exception as e:
+            print(f"Error resolving category attributes: {e}")
+            attribute_ids = {category_id: [] for category_id in attribute_ids}
         
-        return pipeline_stages
+        clauses = [{"categoryAttribute": {"$in": ids}} for ids in attribute_ids.values()]
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
     
-    def _get_category_id(self, tenant_id: str, category_name: str) -> Optional[ObjectId]:
-        """Get ObjectId for category name"""
+    def _get_category_ids(self, tenant_id: str, category_names: List[str]) -> Dict[str, ObjectId]:
+        """Get ObjectIds for several category names in a single query"""
+        if not category_names:
+            return {}
         try:
             db = self.schema_util.db
-            category_doc = db.categories.find_one({
-                "tenant": ObjectId(tenant_id),
-                "name": category_name
-            })
-            return category_doc["_id"] if category_doc else None
+            category_docs = db.categories.find(
+                {"tenant": to_object_id(tenant_id), "name": {"$in": category_names}},
+                {"_id": 1, "name": 1}
+            )
+            return {doc["name"]: doc["_id"] for doc in category_docs}
         except Exception as e:
-            print(f"Error getting category ID: {e}")
-            return None
+            print(f"Error getting category IDs: {e}")
+            return {}
+    
+    def ensure_indexes(self):
+        """Create the indexes the category-filter $match and the query hints rely on (idempotent)"""
+        db = self.schema_util.db
+        try:
+            db.sitemaps.create_index([("tenant", 1)])
+            db.sitemaps.create_index([("tenant", 1), ("createdAt", -1)])
+            db.sitemaps.create_index([("tenant", 1), ("categoryAttribute", 1)])
+            db.sitemaps.create_index([("tenant", 1), ("categoryAttribute", 1), ("createdAt", -1)])
+            db.category_attributes.create_index([("tenant", 1), ("category", 1), ("name", 1)])
+            self._indexes_ready = True
+        except Exception as e:
+            print(f"Error creating indexes: {e}")
+        
+        # A collection can only have one text index - if another one already exists, $text uses that
+        try:
+            db.sitemaps.create_index(
+                [("name", "text"), ("description", "text"), ("summary", "text")],
+                weights={"name": 10, "description": 3, "summary": 1},
+                name="sitemaps_semantic_text"
+            )
+        except Exception as e:
+            print(f"Skipping semantic text index: {e}")
     
     def execute_query(self, mongo_db, query_spec: Dict) -> Any:
         """Execute the built query against MongoDB"""
@@ -245,11 +353,27 @@ class MongoQueryBuilder:
         
         try:
             if operation == "aggregate":
-                return list(collection.aggregate(query_spec["pipeline"]))
+                return list(self._aggregate_cursor(collection, query_spec))
             elif operation == "count_documents":
-                return collection.count_documents(query_spec["filter"])
+                if query_spec.get("hint"):
+                    total = collection.count_documents(query_spec["filter"], hint=query_spec["hint"])
+                else:
+                    total = collection.count_documents(query_spec["filter"])
+                # Same shape as a {"$count": "total"} pipeline (empty when nothing matches) - callers expect a list
+                return [{"total": total}] if total else []
             elif operation == "find":
-                return list(collection.find(query_spec["filter"]).limit(query_spec.get("limit", 300)))
+                projection = query_spec.get(
+                    "projection",
+                    self.SITEMAP_PROJECTION if query_spec["collection"] == "sitemaps" else None
+                )
+                cursor = collection.find(query_spec["filter"], projection)
+                if query_spec.get("skip"):
+                    cursor = cursor.skip(query_spec["skip"])
+                if query_spec.get("limit"):
+                    cursor = cursor.limit(query_spec["limit"])
+                if query_spec.get("hint"):
+                    cursor = cursor.hint(query_spec["hint"])
+                return list(cursor)
             else:
                 raise ValueError(f"Unknown operation: {operation}")
                 
@@ -257,9 +381,115 @@ class MongoQueryBuilder:
             print(f"Query execution error: {e}")
             return None
 
+    def execute_list_with_stats(self, mongo_db, query_spec: Dict,
+                                stat_fields: Optional[List[str]] = None) -> Optional[Dict]:
+        """
+        Run a list spec as a single $facet aggregation: the requested page, the total number of
+        matching documents and numeric summaries over all of them - one round trip instead of one
+        per figure. Returns {"data": [...], "stats": {...}} (stats shaped like
+        AnalyticsEngine.calculate_summary_stats), or None on error.
+        """
+        stat_fields = list(stat_fields or self.LIST_STAT_FIELDS)
+        faceted_spec = {key: value for key, value in query_spec.items() if key != "batch_size"}
+        for key in ("pipeline", "fallback_pipeline"):
+            if key in query_spec:
+                faceted_spec[key] = self._facet_list_pipeline(query_spec[key], stat_fields)
+        
+        try:
+            collection = mongo_db[query_spec["collection"]]
+            result = next(self._aggregate_cursor(collection, faceted_spec), None) or {}
+        except Exception as e:
+            print(f"Query execution error: {e}")
+            return None
+        
+        total = result["total"][0]["n"] if result.get("total") else 0
+        group = result["stats"][0] if result.get("stats") else {}
+        summary = {}
+        for i, field in enumerate(stat_fields):
+            count = group.get(f"f{i}_count", 0)
+            if count:
+                summary[field] = {
+                    "count": count,
+                    "sum": group[f"f{i}_sum"],
+                    "average": group[f"f{i}_sum"] / count,
+                    "min": group[f"f{i}_min"],
+                    "max": group[f"f{i}_max"],
+                    "non_null_percentage": (count / total) * 100
+                }
+            else:
+                summary[field] = {"count": 0, "message": "No valid numeric values found"}
+        
+        return {
+            "data": result.get("data", []),
+            "stats": {"total_documents": total, "fields_analyzed": stat_fields, "summary": summary}
+        }
+    
+    def fetch_list_page(self, mongo_db, query_params: Dict, skip: int, limit: int) -> List[Dict]:
+        """
+        One page of a list query: the parser's params rebuilt with skip/limit, so a pager can move
+        past the first DEFAULT_LIST_LIMIT rows the advisory pipeline fetched. [] on error.
+        """
+        page_query = self.build_query({**query_params, "skip": skip, "limit": limit})
+        return self.execute_query(mongo_db, page_query) or []
+
+    def _facet_list_pipeline(self, pipeline: List[Dict], stat_fields: List[str]) -> List[Dict]:
+        """Keep the leading $match (and its index use), then fan out into page / total / stats facets"""
+        group = {"_id": None}
+        for i, field in enumerate(stat_fields):
+            value = f"${field}"
+            numeric = {"$isNumber": value}
+            group[f"f{i}_count"] = {"$sum": {"$cond": [numeric, 1, 0]}}
+            group[f"f{i}_sum"] = {"$sum": value}
+            group[f"f{i}_min"] = {"$min": {"$cond": [numeric, value, None]}}
+            group[f"f{i}_max"] = {"$max": {"$cond": [numeric, value, None]}}
+        
+        return [
+            pipeline[0],
+            {"$facet": {
+                "data": pipeline[1:],
+                "total": [{"$count": "n"}],
+                "stats": [{"$group": group}]
+            }}
+        ]
+    
+    def stream_query(self, mongo_db, query_spec: Dict) -> Iterator[Dict]:
+        """
+        Lazily yield the documents of an aggregate query spec, one cursor batch at a time.
+        Use this when only the first page is needed; execute_query still returns a full list.
+        """
+        if query_spec["operation"] != "aggregate":
+            raise ValueError(f"stream_query only supports aggregate specs, got: {query_spec['operation']}")
+        
+        collection = mongo_db[query_spec["collection"]]
+        yield from self._aggregate_cursor(collection, query_spec)
+    
+    def _aggregate_cursor(self, collection, query_spec: Dict):
+        """Open the aggregate cursor for a spec, retrying with its fallback pipeline on OperationFailure"""
+        batch_size = query_spec.get("batch_size")
+        try:
+            return self._aggregate(collection, query_spec["pipeline"], query_spec.get("hint"), batch_size)
+        except OperationFailure as e:
+            # e.g. no text index for $text - retry with the regex variant if the builder provided one
+            if "fallback_pipeline" not in query_spec:
+                raise
+            print(f"Primary pipeline failed, using fallback: {e}")
+            return self._aggregate(collection, query_spec["fallback_pipeline"], query_spec.get("fallback_hint"), batch_size)
+    
+    def _aggregate(self, collection, pipeline: List[Dict], hint: Optional[List[tuple]] = None,
+                   batch_size: Optional[int] = None):
+        """collection.aggregate with an optional index hint and cursor batch size"""
+        kwargs = {"allowDiskUse": False}
+        if hint:
+            kwargs["hint"] = hint
+        if batch_size:
+            kwargs["batchSize"] = batch_size
+        return collection.aggregate(pipeline, **kwargs)
+
 # Factory function
 def create_query_builder(tenant_schema_util) -> MongoQueryBuilder:
-    return MongoQueryBuilder(tenant_schema_util)
+    query_builder = MongoQueryBuilder(tenant_schema_util)
+    query_builder.ensure_indexes()
+    return query_builder
 
 # Example usage
 if __name__ == "__main__":
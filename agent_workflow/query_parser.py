@@ -1,12 +1,19 @@
-import os
 import json
+import copy
+import hashlib
+import logging
+import threading
+import numpy as np
 from openai import OpenAI
+from openai_client import get_openai_client
 from dotenv import load_dotenv
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 """ look into the operations 
 to do : 
 * add date ranges in the output schema and is marketing column info and language info 
@@ -26,10 +33,89 @@ class QueryResult:
     tenant_id: str
     needs_data: bool  # Whether advisory needs supporting data
 
+def _categories_fingerprint(categories: Dict[str, List[str]]) -> str:
+    """Stable hash of a tenant's categories (changes whenever the available values change)"""
+    return hashlib.blake2b(json.dumps(categories, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+
+class SemanticParseCache:
+    """
+    Reuses parse results for paraphrased queries ("show tofu" / "list tofu content").
+    
+    A hit needs cosine similarity >= threshold on sentence embeddings, the same tenant
+    categories, and the same category values mentioned in the query text - so
+    "show TOFU" never returns the filters cached for "show BOFU".
+    """
+    
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", threshold: float = 0.92, max_entries: int = 1024):
+        self.model_name = model_name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._model = None
+        self._enabled = True
+        self._lock = threading.Lock()
+        # categories fingerprint -> (embedding matrix, [(mentioned values, parsed result)])
+        self._entries: Dict[str, Tuple[np.ndarray, List[Tuple[frozenset, Dict]]]] = {}
+    
+    def _embed(self, query_text: str) -> Optional[np.ndarray]:
+        if not self._enabled:
+            return None
+        if self._model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+                self._model = SentenceTransformer(self.model_name)
+            except Exception as e:
+                logger.warning(f"Semantic parse cache disabled: {e}")
+                self._enabled = False
+                return None
+        return self._model.encode(query_text, normalize_embeddings=True)
+    
+    @staticmethod
+    def _mentioned_values(query_text: str, categories: Dict[str, List[str]]) -> frozenset:
+        query_lower = query_text.lower()
+        return frozenset(value for values in categories.values() for value in values if value.lower() in query_lower)
+    
+    def lookup(self, query_text: str, categories: Dict[str, List[str]], fingerprint: str) -> Tuple[Optional[Dict], Optional[np.ndarray]]:
+        """Return (cached parse or None, query embedding) - the embedding is reused by add()"""
+        embedding = self._embed(query_text)
+        entry = self._entries.get(fingerprint)
+        if embedding is None or entry is None:
+            return None, embedding
+        
+        matrix, results = entry
+        similarities = matrix @ embedding
+        best = int(np.argmax(similarities))
+        mentioned, parsed = results[best]
+        if similarities[best] >= self.threshold and mentioned == self._mentioned_values(query_text, categories):
+            return copy.deepcopy(parsed), embedding
+        return None, embedding
+    
+    def add(self, query_text: str, categories: Dict[str, List[str]], fingerprint: str,
+            embedding: Optional[np.ndarray], parsed: Dict):
+        if embedding is None:
+            return
+        with self._lock:
+            matrix, results = self._entries.get(fingerprint, (np.empty((0, embedding.shape[0]), dtype=embedding.dtype), []))
+            if len(results) >= self.max_entries:
+                matrix, results = matrix[1:], results[1:]  # drop the oldest entry
+            self._entries[fingerprint] = (
+                np.vstack([matrix, embedding]),
+                results + [(self._mentioned_values(query_text, categories), copy.deepcopy(parsed))]
+            )
+
+
 class QueryParser:
-    def __init__(self, tenant_schema_util, openai_api_key: str = None):
+    def __init__(self, tenant_schema_util, openai_api_key: str = None, parse_cache: Optional[SemanticParseCache] = None):
         self.schema_util = tenant_schema_util
-        self.client = OpenAI(api_key=openai_api_key or os.getenv("OPENAI_API_KEY"))
+        self._openai_api_key = openai_api_key
+        self.parse_cache = parse_cache or SemanticParseCache()
+        # (tenant_id, categories fingerprint) -> (tools payload, system message)
+        self._prompt_cache: Dict[Tuple[str, str], Tuple[List[Dict], str]] = {}
+    
+    @property
+    def client(self) -> OpenAI:
+        """Shared OpenAI client, resolved on first use (no connection pool is built until a call needs it)"""
+        return get_openai_client(self._openai_api_key)
     
     def parse(self, query_text: str, tenant_id: str) -> QueryResult:
         
@@ -39,7 +125,7 @@ class QueryParser:
             raise ValueError(f"Tenant {tenant_id} not found")
         
         # Parse with single LLM call
-        parsed = self._parse_query(query_text, schema.categories)
+        parsed = self._parse_query(query_text, tenant_id, schema.categories)
         
         return QueryResult(
             route=parsed["route"],
@@ -50,17 +136,52 @@ class QueryParser:
             needs_data=parsed.get("needs_supporting_data", False)
         )
     
-    def _parse_query(self, query_text: str, categories: Dict[str, List[str]]) -> Dict:
-        """Single LLM call to parse everything"""
+    def _parse_query(self, query_text: str, tenant_id: str, categories: Dict[str, List[str]]) -> Dict:
+        """Single LLM call to parse everything (skipped when a paraphrase is already cached)"""
+        
+        fingerprint = _categories_fingerprint(categories)
+        cached, embedding = self.parse_cache.lookup(query_text, categories, fingerprint)
+        if cached is not None:
+            return cached
+        
+        schema, system_message = self._get_prompt(tenant_id, categories, fingerprint)
+        
+        completion = self.client.chat.completions.create(
+            model="gpt-5",
+            messages=[
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": query_text}
+            ],
+            tools=schema,
+            tool_choice={"type": "function", "function": {"name": "parse_query"}},
+            # temperature=0,
+            # top_p=1
+        )
+        
+        parsed = json.loads(completion.choices[0].message.tool_calls[0].function.arguments)
+        self.parse_cache.add(query_text, categories, fingerprint, embedding, parsed)
+        return parsed
+    
+    def _get_prompt(self, tenant_id: str, categories: Dict[str, List[str]], fingerprint: str) -> Tuple[List[Dict], str]:
+        """
+        Tool schema and system message for a tenant, built once per categories fingerprint -
+        repeated queries send a byte-identical prefix (cheaper to build, and OpenAI-cacheable).
+        """
+        key = (tenant_id, fingerprint)
+        cached = self._prompt_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # Sorted categories/values so the same tenant data always renders to the same bytes
+        categories_items = sorted((cat, sorted(values)) for cat, values in categories.items() if values)
         
         # Build filter properties dynamically
         filter_props = {}
-        for cat, values in categories.items():
-            if values:
-                filter_props[cat] = {
-                    "type": "array",
-                    "items": {"type": "string", "enum": values}
-                }
+        for cat, values in categories_items:
+            filter_props[cat] = {
+                "type": "array",
+                "items": {"type": "string", "enum": values}
+            }
         
         schema = [{
             "type": "function",
@@ -101,13 +222,11 @@ class QueryParser:
             }
         }]
         
-        categories_str = "\n".join([f"- {cat}: {vals}" for cat, vals in categories.items() if vals])
+        categories_str = "\n".join(f"- {cat}: {vals}" for cat, vals in categories_items)
         
+        # Static instructions first, tenant categories last - the shared prefix is as long as possible
         system_message = f"""Parse user queries for a content management system.
 
-Available categories:
-{categories_str}
-
 ROUTING:
 - database: "Show me X", "How many X", "List X", "Count X" 
 - advisory: "Are we X?", "Should we X?", "Why X?", "What's our strategy?"
@@ -118,21 +237,13 @@ OPERATIONS:
 - aggregate: Group by categories
 - insight: Business advisory
 
-Extract exact category values that match the query. For advisory questions, determine if supporting data analysis is needed."""
+Extract exact category values that match the query. For advisory questions, determine if supporting data analysis is needed.
 
-        completion = self.client.chat.completions.create(
-            model="gpt-5",
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": query_text}
-            ],
-            tools=schema,
-            tool_choice={"type": "function", "function": {"name": "parse_query"}},
-            # temperature=0,
-            # top_p=1
-        )
+Available categories:
+{categories_str}"""
         
-        return json.loads(completion.choices[0].message.tool_calls[0].function.arguments)
+        self._prompt_cache[key] = (schema, system_message)
+        return schema, system_message
     
     def get_database_query_params(self, result: QueryResult) -> Optional[Dict]:
         """Get parameters for MongoDB query builder"""
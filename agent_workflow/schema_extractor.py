@@ -2,10 +2,13 @@ from pymongo import MongoClient
 from bson import ObjectId
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import time
+from functools import lru_cache
 """
-extract_categorical_fields & _get_collection_names --> to get categories 
-get_sample_documents --> to get samples for llm context(does have problems only gets categories not the sample we want)
+extract_categorical_fields & _get_names_by_collection --> to get categories 
+get_sample_documents --> to get samples for llm context
 get_collection_counts --> get the counts for each collection(tenant wise)
 
 to do : 
@@ -13,6 +16,12 @@ to do :
 - provide field mapping as well (right now only collection info)
 """
 
+@lru_cache(maxsize=4096)
+def to_object_id(value: str) -> ObjectId:
+    """ObjectId for a hex id string, memoized - tenant ids are re-parsed on nearly every query"""
+    return ObjectId(value)
+
+
 @dataclass
 class CollectionInfo:
     name: str
@@ -29,9 +38,14 @@ class TenantSchema:
     total_documents: Dict[str, int]
 
 class TenantSchemaUtil:
+    # Tenant schemas are effectively static within a session - reuse them for a few minutes
+    SCHEMA_CACHE_TTL = 300  # seconds
+    SCHEMA_CACHE_MAX_SIZE = 1024
+    
     def __init__(self, mongo_client: MongoClient, database_name: str):
         self.client = mongo_client
         self.db = self.client[database_name]
+        self._schema_cache: Dict[tuple, tuple] = {}  # (tenant_id, include_samples) -> (expires_at, TenantSchema)
         
         # Fixed collection structure
         self.collections_info = {
@@ -43,10 +57,18 @@ class TenantSchemaUtil:
             "sitemaps": CollectionInfo(name="sitemaps", id_field="_id", name_field="name", tenant_field="tenant"),
         }
     
+    def ensure_indexes(self):
+        """Create the tenant index every tenant-scoped query relies on (idempotent)"""
+        try:
+            for collection_name in self.collections_info:
+                self.db[collection_name].create_index([("tenant", 1)])
+        except Exception as e:
+            logging.error(f"Error creating tenant indexes: {e}")
+    
     def validate_tenant(self, tenant_id: str) -> bool:
         """Check if tenant exists in any collection"""
         try:
-            tenant_obj_id = ObjectId(tenant_id)
+            tenant_obj_id = to_object_id(tenant_id)
             # Check in categories collection (most likely to have data)
             exists = self.db.sitemaps.find_one({"tenant": tenant_obj_id}) is not None
             return exists
@@ -57,33 +79,41 @@ class TenantSchemaUtil:
     def extract_categorical_fields(self, tenant_id: str) -> Dict[str, List[str]]:
         """Extract all categorical values for the tenant"""
         try:
-            tenant_obj_id = ObjectId(tenant_id)
+            tenant_obj_id = to_object_id(tenant_id)
             categories = {}
             
-            # Get all category names first
-            category_docs = list(self.db.categories.find({"tenant": tenant_obj_id}))
+            # Categories joined with their attributes in one aggregation (instead of one query per category)
+            pipeline = [
+                {"$match": {"tenant": tenant_obj_id}},
+                {"$lookup": {
+                    "from": "category_attributes",
+                    "let": {"category_id": "$_id"},
+                    "pipeline": [
+                        {"$match": {"$expr": {"$and": [
+                            {"$eq": ["$category", "$$category_id"]},
+                            {"$eq": ["$tenant", tenant_obj_id]}
+                        ]}}},
+                        {"$project": {"_id": 0, "name": 1}}
+                    ],
+                    "as": "attributes"
+                }},
+                {"$project": {"_id": 0, "name": 1, "attributes": "$attributes.name"}}
+            ]
             
-            for category_doc in category_docs:
+            for category_doc in self.db.categories.aggregate(pipeline):
                 category_name = category_doc.get("name", "Unknown") #if name exists then get name otherwise unknown instead of throwing error 
-                category_id = category_doc["_id"]
                 
-                # Get attributes for this category
-                attributes = list(self.db.category_attributes.find({
-                    "tenant": tenant_obj_id,
-                    "category": category_id
-                }))
-                
-                # Extract unique attribute names
-                attribute_names = [attr.get("name", "") for attr in attributes if attr.get("name")]
-                unique_attributes = list(set(attribute_names))
+                # Extract unique attribute names (order-preserving)
+                unique_attributes = list(dict.fromkeys(name for name in category_doc.get("attributes", []) if name))
                 
                 if unique_attributes:
                     categories[category_name] = unique_attributes
             
-            # Also extract other categorical data
-            categories["Topics"] = self._get_collection_names(tenant_obj_id, "topics")
-            categories["Content Types"] = self._get_collection_names(tenant_obj_id, "content_types")
-            categories["Custom Tags"] = self._get_collection_names(tenant_obj_id, "custom_tags")
+            # Also extract other categorical data (single round trip for all three collections)
+            names = self._get_names_by_collection(tenant_obj_id, ["topics", "content_types", "custom_tags"])
+            categories["Topics"] = names.get("topics", [])
+            categories["Content Types"] = names.get("content_types", [])
+            categories["Custom Tags"] = names.get("custom_tags", [])
             
             return categories # categories would be in list format 
             
@@ -91,37 +121,49 @@ class TenantSchemaUtil:
             logging.error(f"Error extracting categories for tenant {tenant_id}: {e}")
             return {}
     
-    def _get_collection_names(self, tenant_obj_id: ObjectId, collection_name: str) -> List[str]:
-        """Helper to get all names from a collection for a tenant"""
+    def _get_names_by_collection(self, tenant_obj_id: ObjectId, collection_names: List[str]) -> Dict[str, List[str]]:
+        """Helper to get the unique names of several collections for a tenant in one aggregation ($unionWith)"""
+        def branch(collection_name: str) -> List[Dict]:
+            return [
+                {"$match": {"tenant": tenant_obj_id, "name": {"$nin": [None, ""]}}},
+                {"$project": {"_id": 0, "name": 1, "collection": {"$literal": collection_name}}}
+            ]
+        
         try:
-            docs = list(self.db[collection_name].find({"tenant": tenant_obj_id}))
-            names = [doc.get("name", "") for doc in docs if doc.get("name")]
-            return list(set(names))  # Remove duplicates
+            first, *others = collection_names
+            pipeline = branch(first)
+            for collection_name in others:
+                pipeline.append({"$unionWith": {"coll": collection_name, "pipeline": branch(collection_name)}})
+            pipeline.append({"$group": {"_id": "$collection", "names": {"$addToSet": "$name"}}})
+            
+            return {doc["_id"]: doc["names"] for doc in self.db[first].aggregate(pipeline)}
         except Exception as e:
-            logging.error(f"Error getting names from {collection_name}: {e}")
-            return []
+            logging.error(f"Error getting names from {collection_names}: {e}")
+            return {}
     
     def get_sample_documents(self, tenant_id: str, sample_size: int = 3) -> Dict[str, List[Dict]]:
-        """Get sample documents from each collection for the tenant
-        Things to do : doesn't work properly have to think of logic that fetches data from all collections  """
+        """Get sample documents from each collection for the tenant (one $unionWith aggregation)"""
         try:
-            tenant_obj_id = ObjectId(tenant_id)
-            samples = {}
-            
-            for collection_name in self.collections_info.items():
-                # Get sample documents
-                docs = list(self.db[collection_name].find(
-                    {"tenant": tenant_obj_id}
-                ).limit(sample_size))
-                
-                # Clean documents for readability
-                cleaned_docs = []
-                for doc in docs:
-                    # Convert ObjectIds to strings for JSON serialization
-                    cleaned_doc = self._clean_document(doc)
-                    cleaned_docs.append(cleaned_doc)
-                
-                samples[collection_name] = cleaned_docs
+            tenant_obj_id = to_object_id(tenant_id)
+            samples = {collection_name: [] for collection_name in self.collections_info}
+            
+            # One aggregation for all collections: each branch takes sample_size docs and tags its source
+            def branch(collection_name: str) -> List[Dict]:
+                return [
+                    {"$match": {"tenant": tenant_obj_id}},
+                    {"$limit": sample_size},
+                    {"$addFields": {"_collection": collection_name}}
+                ]
+            
+            first, *others = samples.keys()
+            pipeline = branch(first)
+            for collection_name in others:
+                pipeline.append({"$unionWith": {"coll": collection_name, "pipeline": branch(collection_name)}})
+            
+            for doc in self.db[first].aggregate(pipeline):
+                collection_name = doc.pop("_collection")
+                # Clean documents for readability (convert ObjectIds to strings for JSON serialization)
+                samples[collection_name].append(self._clean_document(doc))
             
             return samples
             
@@ -132,12 +174,20 @@ class TenantSchemaUtil:
     def get_collection_counts(self, tenant_id: str) -> Dict[str, int]:
         """Get document counts for each collection for the tenant"""
         try:
-            tenant_obj_id = ObjectId(tenant_id)
-            counts = {}
+            tenant_obj_id = to_object_id(tenant_id)
             
-            for collection_name in self.collections_info.keys():
-                count = self.db[collection_name].count_documents({"tenant": tenant_obj_id})
-                counts[collection_name] = count
+            # Independent counts - issue them concurrently (MongoClient is thread-safe)
+            with ThreadPoolExecutor(max_workers=len(self.collections_info)) as executor:
+                futures = {
+                    # No hint: the tenant equality already selects the tenant index, and hinting
+                    # a missing index would fail every count
+                    collection_name: executor.submit(
+                        self.db[collection_name].count_documents,
+                        {"tenant": tenant_obj_id}
+                    )
+                    for collection_name in self.collections_info
+                }
+                counts = {collection_name: future.result() for collection_name, future in futures.items()}
             
             return counts
             
@@ -158,22 +208,28 @@ class TenantSchemaUtil:
         return cleaned
     
     def get_tenant_schema(self, tenant_id: str, include_samples: bool = True) -> Optional[TenantSchema]:
-        """Main function to get complete tenant schema information"""
+        """Main function to get complete tenant schema information (cached per tenant for SCHEMA_CACHE_TTL)"""
+        cache_key = (tenant_id, include_samples)
+        cached = self._schema_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        
         try:
-            # Validate tenant exists
-            if not self.validate_tenant(tenant_id):
-                logging.warning(f"Tenant {tenant_id} not found")
-                return None
-            
-            # Extract categorical data
-            categories = self.extract_categorical_fields(tenant_id)
-            
-            # Get sample documents if requested
-            samples = self.get_sample_documents(tenant_id) if include_samples else {}
-
-            
-            # Get document counts
-            counts = self.get_collection_counts(tenant_id)
+            # The four lookups are independent round trips - overlap them (MongoClient is thread-safe)
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                valid_future = executor.submit(self.validate_tenant, tenant_id)
+                categories_future = executor.submit(self.extract_categorical_fields, tenant_id)
+                samples_future = executor.submit(self.get_sample_documents, tenant_id) if include_samples else None
+                counts_future = executor.submit(self.get_collection_counts, tenant_id)
+                
+                # Validate tenant exists
+                if not valid_future.result():
+                    logging.warning(f"Tenant {tenant_id} not found")
+                    return None
+                
+                categories = categories_future.result()
+                samples = samples_future.result() if samples_future else {}
+                counts = counts_future.result()
             
             # Create schema object
             schema = TenantSchema(
@@ -184,12 +240,21 @@ class TenantSchemaUtil:
                 total_documents=counts
             )
             
+            if len(self._schema_cache) >= self.SCHEMA_CACHE_MAX_SIZE:
+                self._schema_cache.pop(next(iter(self._schema_cache)))  # drop the oldest entry
+            self._schema_cache[cache_key] = (time.monotonic() + self.SCHEMA_CACHE_TTL, schema)
+            
             return schema
             
         except Exception as e:
             logging.error(f"Error getting tenant schema for {tenant_id}: {e}")
             return None
     
+    def invalidate_tenant(self, tenant_id: str):
+        """Drop cached schemas for a tenant (call after writes that change its categories)"""
+        for cache_key in [key for key in self._schema_cache if key[0] == tenant_id]:
+            self._schema_cache.pop(cache_key, None)
+    
     def format_schema_for_llm(self, schema: TenantSchema) -> str:
         """Format schema information for LLM consumption"""
         if not schema:
@@ -223,7 +288,9 @@ class TenantSchemaUtil:
 def create_schema_util(connection_string: str, database_name: str) -> TenantSchemaUtil:
     """Factory function to create schema utility"""
     client = MongoClient(connection_string)
-    return TenantSchemaUtil(client, database_name)
+    schema_util = TenantSchemaUtil(client, database_name)
+    schema_util.ensure_indexes()
+    return schema_util
 
 
 if __name__ == "__main__":
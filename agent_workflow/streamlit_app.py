@@ -1,12 +1,12 @@
 import streamlit as st
 import pandas as pd
-from pymongo import MongoClient
+from bson import ObjectId
 
 from query_parser import create_parser
-from query_builder import create_query_builder
+from query_builder import create_query_builder, MongoQueryBuilder
 from schema_extractor import create_schema_util
 from analytics_engine import create_analytics_engine
-from advisory_answers import create_llm_advisor, get_complete_advisory_response
+from advisory_answers import create_llm_advisor, stream_complete_advisory_response, AdvisoryResponseCache
 
 # -----------------------------
 # Streamlit App Config
@@ -23,41 +23,117 @@ MONGO_URI = "mongodb://localhost:27017"
 DB_NAME = "my_database"
 TENANT_ID = "6875f3afc8337606d54a7f37"
 
-client = MongoClient(MONGO_URI)
-mongo_db = client[DB_NAME]
+# Rows shown per page in the filtered data table - one list query page, so page 1 is the pipeline's own rows
+PAGE_SIZE = MongoQueryBuilder.DEFAULT_LIST_LIMIT
 
 # -----------------------------
-# Initialize Components
+# Initialize Components (once per process - Streamlit reruns this script on every interaction)
 # -----------------------------
-schema_util = create_schema_util(MONGO_URI, DB_NAME)
-query_parser = create_parser(schema_util)
-query_builder = create_query_builder(schema_util)
-analytics_engine = create_analytics_engine()
-llm_advisor = create_llm_advisor()
+@st.cache_resource
+def get_components():
+    schema_util = create_schema_util(MONGO_URI, DB_NAME)
+    query_parser = create_parser(schema_util)
+    # Shares the parser's semantic cache, so only one embedding model is loaded
+    response_cache = AdvisoryResponseCache(schema_util.db, semantic_cache=query_parser.parse_cache)
+    response_cache.ensure_indexes()
+    return (
+        schema_util,
+        query_parser,
+        create_query_builder(schema_util),
+        create_analytics_engine(),
+        create_llm_advisor(),
+        response_cache
+    )
+
+schema_util, query_parser, query_builder, analytics_engine, llm_advisor, response_cache = get_components()
+
+# Reuse the schema util's MongoClient instead of opening a second connection pool
+mongo_db = schema_util.db
+
+def build_results_frame(rows):
+    """
+    Build the results table column by column - pandas skips per-record key inference, and
+    ObjectId values become strings Arrow can serialize. Columns are the union of the rows'
+    keys in first-seen order ($project leaves out fields a document doesn't have).
+    """
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    data = {
+        column: [str(value) if isinstance(value, ObjectId) else value
+                 for value in (row.get(column) for row in rows)]
+        for column in columns
+    }
+    return pd.DataFrame(data, columns=columns)
+
+def persist_stream(chunks):
+    """Mirror streamed chunks into session state, so a rerun mid-stream still has the partial answer"""
+    st.session_state["advisory_partial"] = ""
+    for chunk in chunks:
+        st.session_state["advisory_partial"] += chunk
+        yield chunk
+
+def get_page_rows(response, page):
+    """
+    Rows for one page of the filtered data table. Grouped results are complete in raw_data;
+    list results only carry their first page, so later pages are re-queried with skip/limit
+    (and kept in session state so reruns don't hit the database again).
+    """
+    rows = response.get("raw_data", [])
+    if response["parsed_result"].operation != "list" or page == 0:
+        return rows[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+    
+    list_pages = st.session_state.setdefault("list_pages", {})
+    if page not in list_pages:
+        query_params = query_parser.get_database_query_params(response["parsed_result"])
+        list_pages[page] = query_builder.fetch_list_page(mongo_db, query_params,
+                                                         skip=page * PAGE_SIZE, limit=PAGE_SIZE)
+    return list_pages[page]
 
 # -----------------------------
 # UI Input
 # -----------------------------
 user_query = st.text_input("💬 Enter your question:", placeholder="e.g., How many BOFU pages do we have?")
+cache_bypass = st.checkbox("Recompute (ignore cached answers)", value=False)
 
-if st.button("Run Analysis") and user_query:
+# The last answer lives in session state: reruns (expander toggles, paging, re-clicking the
+# button for the same question) render it again instead of re-running the pipeline
+run_clicked = st.button("Run Analysis")
+last_answer_complete = bool((st.session_state.get("last_response") or {}).get("advisory_response"))
+if run_clicked and user_query and (cache_bypass or user_query != st.session_state.get("last_query")
+                                   or not last_answer_complete):
     with st.spinner("Analyzing..."):
-        response = get_complete_advisory_response(
+        # The advisory text itself is streamed into the page below, as the model writes it
+        st.session_state["last_response"], st.session_state["advisory_stream"] = stream_complete_advisory_response(
             query_text=user_query,
             tenant_id=TENANT_ID,
             query_parser=query_parser,
             query_builder=query_builder,
             analytics_engine=analytics_engine,
             mongo_db=mongo_db,
-            llm_advisor=llm_advisor
+            llm_advisor=llm_advisor,
+            response_cache=response_cache,
+            cache_bypass=cache_bypass
         )
+    st.session_state["last_query"] = user_query
+    st.session_state["page"] = 0
+    st.session_state["list_pages"] = {}
+    st.session_state["advisory_partial"] = ""
 
+response = st.session_state.get("last_response")
+if response is not None:
     if response["success"]:
         st.success("✅ Advisory response generated")
         
         # Show advisory
         st.subheader("📌 Advisory Response")
-        st.write(response["advisory_response"])
+        advisory_stream = st.session_state.pop("advisory_stream", None)
+        if advisory_stream is not None:
+            st.write_stream(persist_stream(advisory_stream))
+        elif response["advisory_response"]:
+            st.write(response["advisory_response"])
+        else:
+            # The stream was cut off by a rerun (e.g. a pager click) - keep what had arrived
+            st.write(st.session_state.get("advisory_partial", ""))
+            st.caption("Answer interrupted - run the analysis again for the full response.")
         
         # Show analytics summary
         st.subheader("📈 Analytics Overview")
@@ -66,9 +142,27 @@ if st.button("Run Analysis") and user_query:
         # Button to show filtered data
         if response["data_found"] > 0:
             with st.expander(f"🔎 View Filtered Data ({response['data_found']} documents)"):
-                df = pd.DataFrame(response["parsed_result"].results if hasattr(response["parsed_result"], "results") else response.get("raw_data", []))
-                if not df.empty:
-                    st.dataframe(df)
+                rows = response.get("raw_data", [])
+                if rows:
+                    # List results page through every match (data_found), not just the rows fetched so far
+                    total_rows = response["data_found"] if response["parsed_result"].operation == "list" else len(rows)
+                    page_count = (total_rows - 1) // PAGE_SIZE + 1
+                    page = min(st.session_state.get("page", 0), page_count - 1)
+                    # Only the current page is turned into a DataFrame and rendered
+                    page_rows = get_page_rows(response, page)
+                    if page_rows:
+                        st.dataframe(build_results_frame(page_rows))
+                    else:
+                        st.warning("Could not load this page of results.")
+                    
+                    previous_col, info_col, next_col = st.columns([1, 2, 1])
+                    if previous_col.button("◀ Previous", disabled=page == 0):
+                        st.session_state["page"] = page - 1
+                        st.rerun()
+                    info_col.caption(f"Page {page + 1} of {page_count}")
+                    if next_col.button("Next ▶", disabled=page >= page_count - 1):
+                        st.session_state["page"] = page + 1
+                        st.rerun()
                 else:
                     st.warning("No structured results available to display.")
     else:
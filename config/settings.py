@@ -16,6 +16,9 @@
 #     """Get OpenAI API configuration"""
 
 import os
+from functools import cache
+from types import MappingProxyType
+from typing import Mapping
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 import structlog
@@ -32,6 +35,9 @@ class TenantConfig(BaseModel):
 class DatabaseConfig(BaseModel):
     connection_string: str = Field(default="mongodb://localhost:27017/")
     database_name: str = Field(default="test_database")
+    max_pool_size: int = Field(default=50)
+    min_pool_size: int = Field(default=5)
+    server_selection_timeout_ms: int = Field(default=2000)
 
 
 class OpenAIConfig(BaseModel):
@@ -65,6 +71,9 @@ class Settings:
         return DatabaseConfig(
             connection_string=conn or "mongodb://localhost:27017/",
             database_name=db or "fallback_db",
+            max_pool_size=int(os.getenv("MONGODB_MAX_POOL_SIZE", "50")),
+            min_pool_size=int(os.getenv("MONGODB_MIN_POOL_SIZE", "5")),
+            server_selection_timeout_ms=int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "2000")),
         )
 
     def _load_openai_config(self) -> OpenAIConfig:
@@ -80,21 +89,26 @@ class Settings:
 
 
 # --- Public helper functions ---
+# Environment is read and validated once per process; the config getters return shared read-only views
+@cache
 def load_environment_variables() -> Settings:
     """Load and validate environment variables"""
     return Settings()
 
 
-def get_tenant_config() -> dict:
+@cache
+def get_tenant_config() -> Mapping:
     """Get tenant-specific configuration"""
-    return load_environment_variables().tenant.model_dump()
+    return MappingProxyType(load_environment_variables().tenant.model_dump())
 
 
-def get_database_config() -> dict:
+@cache
+def get_database_config() -> Mapping:
     """Get MongoDB connection configuration"""
-    return load_environment_variables().database.model_dump()
+    return MappingProxyType(load_environment_variables().database.model_dump())
 
 
-def get_openai_config() -> dict:
+@cache
+def get_openai_config() -> Mapping:
     """Get OpenAI API configuration"""
-    return load_environment_variables().openai.model_dump()
+    return MappingProxyType(load_environment_variables().openai.model_dump())
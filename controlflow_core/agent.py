@@ -1,7 +1,12 @@
 # controlflow_core/agent.py - Main ControlFlow Agent Implementation
 
+import os
+import re
+import time
+import threading
+import numpy as np
 import controlflow as cf
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pydantic import BaseModel, Field
 from database.extractor import DynamicTenantSchemaExtractor
 from utils.logger import get_logger
@@ -9,6 +14,27 @@ from utils.logger import get_logger
 
 logger = get_logger("controlflow_agent")
 
+# Tenant schemas change rarely - reuse them across queries for a few minutes
+SCHEMA_CACHE_TTL = 300  # seconds
+_schema_cache: Dict[str, Tuple[float, Any]] = {}  # tenant_id -> (expires_at, TenantSchema)
+_schema_cache_lock = threading.Lock()
+
+
+def get_tenant_schema(tenant_id: str, db=None):
+    """
+    Tenant schema from DynamicTenantSchemaExtractor, memoized per tenant for SCHEMA_CACHE_TTL seconds
+    (db defaults to the shared pooled client's database).
+    """
+    now = time.monotonic()
+    cached = _schema_cache.get(tenant_id)
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    tenant_schema = DynamicTenantSchemaExtractor(tenant_id, db=db).extract_schema()
+    with _schema_cache_lock:
+        _schema_cache[tenant_id] = (now + SCHEMA_CACHE_TTL, tenant_schema)
+    return tenant_schema
+
 
 class QueryContext(BaseModel):
     """Context information for query processing"""
@@ -30,76 +56,128 @@ class QueryResponse(BaseModel):
     query_info: Optional[Dict] = None      # Query processing info
 
 
-def create_tenant_agent(tenant_id: str) -> cf.Agent:
+# Fewer sample values per category once a tenant has many categories (keeps the prompt short)
+MAX_SAMPLE_VALUES = 5
+MAX_SAMPLE_VALUES_LARGE_SCHEMA = 3
+LARGE_SCHEMA_CATEGORIES = 20
+
+# Static instructions for every pipeline task; the tasks themselves only carry the phase
+# name and the per-query values as JSON
+PIPELINE_PHASE_INSTRUCTIONS = """PIPELINE PHASES (each task names its phase; its JSON holds the query-specific values):
+- analysis: confirm the query type, validate the entities against the categories, decide whether more
+  entity extraction is needed, and plan the tools. Return confirmed_query_type, validated_entities,
+  recommended_tools and any clarifications needed from the user.
+- retrieval: follow execution_plan with the tools, scoped to the task's tenant_id only; fall back
+  gracefully on tool errors. Return the raw data needed for the answer, checked for completeness.
+- synthesis: turn the raw data into a QueryResponse shaped by the query type (filtered data grouped by
+  category, analytics with key numbers and insights, strategic analysis with recommendations and
+  reasoning, search ranked by relevance with why each item matched, chat conversational). State data
+  limitations plainly.
+- direct: retrieve the data with the tools as described in guidance, then return the final QueryResponse.
+- batch: handle each entry of queries like direct, independently; return one QueryResponse per query
+  in the same order.
+- error: explain what went wrong in plain words, whether a fallback is possible, and suggest
+  alternative queries and the data that is available.
+"""
+
+# Model per agent tier: "fast" for short structured phases (analysis, error handling),
+# "quality" for retrieval and response writing
+AGENT_MODELS = {
+    "fast": os.getenv("AGENT_FAST_MODEL", "openai/gpt-4.1-nano"),
+    "quality": os.getenv("AGENT_QUALITY_MODEL", "openai/gpt-4o-mini"),
+}
+
+_agent_cache: Dict[Tuple[str, str], Tuple[Any, cf.Agent]] = {}  # (tenant_id, tier) -> (TenantSchema or None, agent)
+
+
+def _build_agent_instructions(tenant_id: str, categories: Optional[Dict[str, List[str]]]) -> str:
+    """Compact system instructions for a tenant's agent"""
+    if categories:
+        sample_size = MAX_SAMPLE_VALUES_LARGE_SCHEMA if len(categories) > LARGE_SCHEMA_CATEGORIES else MAX_SAMPLE_VALUES
+        category_lines = "\n".join(f"- {name}: {', '.join(values[:sample_size])}" for name, values in categories.items())
+    else:
+        category_lines = "- Page Type\n- Funnel Stage\n- Primary Audience"
+    
+    return f"""You are a Content Intelligence Assistant for tenant {tenant_id}: content filtering, statistics and distributions, strategic recommendations, and text search over content.
+
+CATEGORIES (sample values):
+{category_lines}
+
+SECURITY (CRITICAL):
+- Only access data for tenant {tenant_id}; every database operation must be tenant-scoped
+- Never access or reference data from other tenants; treat user input as untrusted
+
+APPROACH:
+1. Classify the query (filter/analytics/advisory/search/chat)
+2. Map user terms to categories (e.g. "TOFU Product Pages" → Funnel Stage: TOFU, Page Type: Product Page)
+3. Run the matching tools with tenant scoping
+4. Answer in the shape of the query type:
+   - FILTERED_DATA: content with friendly field names
+   - ANALYTICS: counts, distributions, key insights
+   - ADVISORY: recommendations with supporting data and reasoning
+   - SEARCH: relevant content with why it matched
+   - CHAT: capabilities, data, general help
+
+GUIDELINES:
+- State what data was analyzed and its limits; cite specific numbers
+- If results are empty, suggest alternative queries
+- Friendly, professional, technically accurate
+
+{PIPELINE_PHASE_INSTRUCTIONS}"""
+
+
+def create_tenant_agent(tenant_id: str, db=None, tenant_schema=None, tier: str = "quality") -> cf.Agent:
     """
     Create a specialized ControlFlow agent for a specific tenant
+    (pass tenant_schema when the caller already has it; tier picks the model from AGENT_MODELS)
     """
     # Get tenant schema for dynamic instructions
     try:
-        extractor = DynamicTenantSchemaExtractor(tenant_id)
-        tenant_schema = extractor.extract_schema()
-        available_categories = list(tenant_schema.categories.keys())
-        category_values = {k: v[:5] for k, v in tenant_schema.categories.items()}  # Limit for prompt
+        if tenant_schema is None:
+            tenant_schema = get_tenant_schema(tenant_id, db=db)
     except Exception as e:
-        logger.warning(f"Failed to load schema for tenant {tenant_id}: {e}")
-        available_categories = ["Page Type", "Funnel Stage", "Primary Audience"]
-        category_values = {}
-
-    agent_instructions = f"""
-You are a specialized Content Intelligence Assistant for tenant {tenant_id}.
-
-CAPABILITIES:
-- Content filtering and retrieval with complex multi-field queries
-- Statistical analysis and distribution reporting
-- Strategic content analysis and recommendations  
-- Text-based search across content descriptions and categories
-- Schema-aware query interpretation with friendly names
-
-AVAILABLE DATA CATEGORIES:
-{', '.join(available_categories)}
-
-SAMPLE CATEGORY VALUES:
-{category_values}
-
-SECURITY & TENANT ISOLATION:
-- CRITICAL: Only access data for tenant {tenant_id}
-- All database operations must include proper tenant scoping
-- Validate all user inputs for security issues
-- Never access or reference data from other tenants
-
-QUERY PROCESSING APPROACH:
-1. Classify the user's query type (filter/analytics/advisory/search/chat)
-2. Extract relevant entities and map them to available categories
-3. Select appropriate tools and execute with proper tenant scoping
-4. Format response based on query type and user expectations
-5. Always provide context about data scope and any limitations
-
-RESPONSE FORMATS BY TYPE:
-- FILTERED_DATA: Return structured content with friendly field names and full relationship resolution
-- ANALYTICS: Provide counts, distributions, and key insights with supporting examples
-- ADVISORY: Give strategic recommendations with supporting data and clear reasoning
-- SEARCH: Return relevant content ranked by relevance with match explanations
-- CHAT: Provide helpful information about capabilities, data, or general assistance
-
-ENTITY EXTRACTION RULES:
-- Map user terms to schema categories (e.g., "TOFU content" → Funnel Stage: TOFU)
-- Handle multiple filters (e.g., "TOFU Product Pages" → Funnel Stage: TOFU, Page Type: Product Page)
-- Recognize search intent vs. filtering intent
-- Identify analytical questions vs. data retrieval questions
-
-QUALITY GUIDELINES:
-- Always explain what data you're analyzing and any limitations
-- Provide specific numbers and examples when possible
-- If results are empty or limited, suggest alternative queries
-- Use friendly, professional tone while being technically accurate
-- When making recommendations, explain the reasoning behind them
-"""
+        logger.warning("Failed to load tenant schema", tenant_id=tenant_id, error=str(e))
+        tenant_schema = None
+    
+    # Agents (and their instructions) are rebuilt only when the tenant's (cached) schema
+    # object changes, so every task of a request - and later requests - share one agent
+    cache_key = (tenant_id, tier)
+    cached = _agent_cache.get(cache_key)
+    if cached and cached[0] is tenant_schema and tenant_schema is not None:
+        return cached[1]
 
-    return cf.Agent(
-        name=f"ContentIntelligence_{tenant_id}",
+    agent_instructions = _build_agent_instructions(tenant_id, tenant_schema.categories if tenant_schema else None)
+    agent = cf.Agent(
+        name=f"ContentIntelligence_{tenant_id}" if tier == "quality" else f"ContentIntelligence_{tenant_id}_{tier}",
         instructions=agent_instructions,
-        model='openai/gpt-4o-mini',  # Use GPT-4 for better reasoning
+        model=AGENT_MODELS[tier],
     )
+    _agent_cache[cache_key] = (tenant_schema, agent)
+    return agent
+
+
+class _PhraseMatcher:
+    """
+    Finds which of a fixed set of lower-cased phrases occur in a text with a single regex scan.
+    
+    All phrases form one alternation (longest first, inside a lookahead so matches can overlap);
+    each phrase also knows the phrases it contains, since a longer match at a position hides
+    the shorter ones starting there.
+    """
+    
+    def __init__(self, phrases):
+        phrases = sorted(set(phrases), key=len, reverse=True)
+        self._pattern = re.compile("(?=(" + "|".join(re.escape(phrase) for phrase in phrases) + "))") if phrases else None
+        self._contained = {phrase: frozenset(other for other in phrases if other in phrase) for phrase in phrases}
+    
+    def find(self, text: str) -> set:
+        """Every phrase that occurs anywhere in text"""
+        if self._pattern is None:
+            return set()
+        found = set()
+        for longest in set(self._pattern.findall(text)):
+            found |= self._contained[longest]
+        return found
 
 
 class QueryClassifier:
@@ -143,71 +221,165 @@ class QueryClassifier:
         }
     }
     
+    # Decisive phrases checked before scoring (in order) - each one only ever wins for its own type
+    FAST_PATH = {
+        "how many": "COUNT_ANALYTICS",
+        "number of": "COUNT_ANALYTICS",
+        "distribution": "DISTRIBUTION_ANALYTICS",
+        "breakdown": "DISTRIBUTION_ANALYTICS",
+        "content gap": "STRATEGIC_ANALYSIS",
+        "should we": "STRATEGIC_ANALYSIS",
+        "are we": "STRATEGIC_ANALYSIS",
+    }
+    
+    # Words that still point to SEARCH when nothing else scores
+    SEARCH_FALLBACK_WORDS = ("about", "find", "search")
+    
+    # Every keyword and fast-path phrase, found in a single scan per query
+    _PHRASES = _PhraseMatcher(
+        [keyword for config in QUERY_PATTERNS.values() for keyword in config["keywords"]]
+        + list(FAST_PATH) + list(SEARCH_FALLBACK_WORDS)
+    )
+    
+    # Compiled once at class load: (keywords, compiled patterns) per query type
+    _COMPILED_PATTERNS = {
+        query_type: (tuple(config["keywords"]), tuple(re.compile(pattern) for pattern in config.get("patterns", [])))
+        for query_type, config in QUERY_PATTERNS.items()
+    }
+    
     @classmethod
     def classify_query(cls, query: str) -> str:
         """Classify a user query into one of the defined types"""
         query_lower = query.lower()
+        phrases = cls._PHRASES.find(query_lower)
+        
+        # Fast path: one decisive phrase settles it
+        for keyword, query_type in cls.FAST_PATH.items():
+            if keyword in phrases:
+                return query_type
         
         # Score each query type
         scores = {}
-        for query_type, config in cls.QUERY_PATTERNS.items():
-            score = 0
-            
+        for query_type, (keywords, patterns) in cls._COMPILED_PATTERNS.items():
             # Keyword matching
-            for keyword in config["keywords"]:
-                if keyword in query_lower:
-                    score += 1
+            score = sum(1 for keyword in keywords if keyword in phrases)
             
-            # Pattern matching (simplified - would use regex in production)
-            for pattern in config.get("patterns", []):
-                # Simple contains check for MVP (could use regex)
-                if any(word in query_lower for word in pattern.replace(r"\w+", "").split()):
-                    score += 2
+            # Pattern matching
+            score += sum(2 for pattern in patterns if pattern.search(query_lower))
             
             scores[query_type] = score
         
         # Return the highest scoring type, default to SEARCH if tied/none
         if max(scores.values()) == 0:
-            return "SEARCH" if any(word in query_lower for word in ["about", "find", "search"]) else "GENERAL_CHAT"
+            return "SEARCH" if any(word in phrases for word in cls.SEARCH_FALLBACK_WORDS) else "GENERAL_CHAT"
         
         return max(scores.items(), key=lambda x: x[1])[0]
 
 
+# Embedding fallback for category values the exact scan misses ("top of funnel" → TOFU); opt-in
+ENTITY_FUZZY_MATCH = os.getenv("ENTITY_FUZZY_MATCH", "false").lower() == "true"
+ENTITY_FUZZY_THRESHOLD = float(os.getenv("ENTITY_FUZZY_THRESHOLD", "0.6"))
+_value_encoder = None
+_value_encoder_failed = False
+
+
+def _get_value_encoder():
+    """Shared sentence-transformers model, loaded on first use (None if unavailable)"""
+    global _value_encoder, _value_encoder_failed
+    if _value_encoder is None and not _value_encoder_failed:
+        try:
+            from sentence_transformers import SentenceTransformer
+            _value_encoder = SentenceTransformer("all-MiniLM-L6-v2")
+        except Exception as e:
+            logger.warning("Entity fuzzy matching disabled", error=str(e))
+            _value_encoder_failed = True
+    return _value_encoder
+
+
+# Words that never make useful search terms
+_STOP_WORDS = frozenset({"about", "related", "to", "content", "articles", "pages", "show", "me", "find"})
+_STRIP_PUNCTUATION = str.maketrans("", "", ".,!?")
+
+# Words that ask for nothing beyond the category filters in count/list questions
+# ("how many ... do we have", "show me all ...") - anything else is reported as unmatched
+_FILLER_WORDS = _STOP_WORDS | frozenset({
+    "how", "many", "what", "which", "the", "a", "an", "of", "in", "on", "for", "with", "and", "all", "any",
+    "do", "does", "we", "our", "i", "have", "has", "are", "is", "there", "get", "list", "display", "give",
+    "count", "number", "total", "item", "items", "page", "article", "piece", "pieces", "post", "posts"
+})
+
+
 class EntityExtractor:
     """Extract relevant entities from user queries based on tenant schema"""
     
     def __init__(self, tenant_schema):
         self.tenant_schema = tenant_schema
+        self._value_matcher = _PhraseMatcher(
+            value.lower() for values in tenant_schema.categories.values() for value in values if value
+        )
+        # (category, value) pairs and their embeddings - encoded in one batch the first time fuzzy matching runs
+        self._value_pairs = [(name, value) for name, values in tenant_schema.categories.items() for value in values if value]
+        self._value_embeddings = None
+    
+    def _fuzzy_match(self, query: str) -> Optional[Tuple[str, str]]:
+        """Closest (category, value) to the query by embedding similarity, if it clears the threshold"""
+        encoder = _get_value_encoder()
+        if encoder is None or not self._value_pairs:
+            return None
+        if self._value_embeddings is None:
+            self._value_embeddings = encoder.encode(
+                [value for _, value in self._value_pairs], batch_size=64,
+                convert_to_numpy=True, normalize_embeddings=True
+            )
+        similarities = self._value_embeddings @ encoder.encode(query, convert_to_numpy=True, normalize_embeddings=True)
+        best = int(np.argmax(similarities))
+        return self._value_pairs[best] if similarities[best] >= ENTITY_FUZZY_THRESHOLD else None
     
     def extract_entities(self, query: str, query_type: str) -> Dict[str, Any]:
         """Extract entities from query based on available schema"""
         entities = {
             "categories": {},
             "search_terms": [],
+            "unmatched_terms": [],
             "modifiers": [],
             "confidence": 0.0
         }
         
         query_lower = query.lower()
+        query_words = query_lower.translate(_STRIP_PUNCTUATION).split()
         
         # Extract category values
+        query_values = self._value_matcher.find(query_lower)
         for category_name, values in self.tenant_schema.categories.items():
-            matched_values = []
-            for value in values:
-                if value.lower() in query_lower:
-                    matched_values.append(value)
+            matched_values = [value for value in values if value.lower() in query_values] if query_values else []
             
             if matched_values:
                 entities["categories"][category_name] = matched_values
                 entities["confidence"] += 0.2
         
+        # Nothing matched exactly - try the closest value by meaning
+        if not entities["categories"] and ENTITY_FUZZY_MATCH:
+            fuzzy = self._fuzzy_match(query_lower)
+            if fuzzy:
+                category_name, value = fuzzy
+                entities["categories"][category_name] = [value]
+                entities["confidence"] += 0.1
+        
         # Extract search terms (for SEARCH queries)
         if query_type == "SEARCH":
             # Remove common words and extract meaningful terms
-            stop_words = {"about", "related", "to", "content", "articles", "pages", "show", "me", "find"}
-            words = [word.strip(".,!?") for word in query_lower.split() if word not in stop_words and len(word) > 2]
+            words = [word for word in query_words if word not in _STOP_WORDS and len(word) > 2]
             entities["search_terms"] = words[:5]  # Limit to 5 terms
         
+        # Words the category matches don't account for ("about crypto", "per funnel stage", "recent"),
+        # for every query type - lets callers tell whether the filters are the whole request
+        covered = set(_FILLER_WORDS)
+        for category_name, values in entities["categories"].items():
+            covered.update(category_name.lower().split())
+            for value in values:
+                covered.update(value.lower().split())
+        entities["unmatched_terms"] = [word for word in query_words if word not in covered]
+        
         # Extract modifiers
         modifiers = []
         if "top" in query_lower:
@@ -230,16 +402,33 @@ class EntityExtractor:
         return entities
 
 
-def create_query_context(tenant_id: str, user_query: str) -> QueryContext:
-    """Create query context with classification and entity extraction"""
+_extractor_cache: Dict[str, Tuple[Any, EntityExtractor]] = {}  # tenant_id -> (TenantSchema, EntityExtractor)
+
+
+def get_entity_extractor(tenant_id: str, db=None, tenant_schema=None) -> EntityExtractor:
+    """EntityExtractor for the tenant's current (cached) schema - its value matcher is built once per schema"""
+    if tenant_schema is None:
+        tenant_schema = get_tenant_schema(tenant_id, db=db)
+    cached = _extractor_cache.get(tenant_id)
+    if cached and cached[0] is tenant_schema:
+        return cached[1]
+    
+    entity_extractor = EntityExtractor(tenant_schema)
+    _extractor_cache[tenant_id] = (tenant_schema, entity_extractor)
+    return entity_extractor
+
+
+def create_query_context(tenant_id: str, user_query: str, db=None, tenant_schema=None) -> QueryContext:
+    """
+    Create query context with classification and entity extraction
+    (pass tenant_schema when the caller already has it - no extractor or cache lookup then)
+    """
     try:
         # Classify query
         query_type = QueryClassifier.classify_query(user_query)
         
         # Extract entities
-        extractor = DynamicTenantSchemaExtractor(tenant_id)
-        tenant_schema = extractor.extract_schema()
-        entity_extractor = EntityExtractor(tenant_schema)
+        entity_extractor = get_entity_extractor(tenant_id, db=db, tenant_schema=tenant_schema)
         extracted_entities = entity_extractor.extract_entities(user_query, query_type)
         
         return QueryContext(
@@ -251,7 +440,7 @@ def create_query_context(tenant_id: str, user_query: str) -> QueryContext:
         )
         
     except Exception as e:
-        logger.error(f"Failed to create query context: {e}")
+        logger.error("Failed to create query context", tenant_id=tenant_id, error=str(e))
         return QueryContext(
             tenant_id=tenant_id,
             user_query=user_query,
@@ -1,14 +1,80 @@
 # controlflow_core/tasks.py - ControlFlow Task Definitions
 
+import asyncio
+import copy
+import hashlib
+import json
+import threading
+import time
+import numpy as np
 import controlflow as cf
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncIterator, Optional, Tuple, Union
 from pydantic import BaseModel, Field
-from controlflow_core.agent import QueryContext, QueryResponse, create_tenant_agent
+from controlflow_core.agent import (
+    AGENT_MODELS, QueryContext, QueryResponse, create_query_context, create_tenant_agent, _get_value_encoder
+)
 from controlflow_core.tools import get_tools_for_query_type
+from database.queries import fetch_content_by_filters, fetch_content_count
+from openai import AsyncOpenAI
 from utils.logger import get_logger
 
 logger = get_logger("controlflow_tasks")
 
+# Synthesis prompts inline raw data up to this size; larger results are paged in through a tool
+RAW_DATA_INLINE_CHARS = 2000
+RAW_DATA_CHUNK_CHARS = 4000
+RAW_DATA_PREVIEW_CHARS = 500
+
+# Same model as the tenant agents; used when the synthesis phase is streamed directly
+STREAMING_SYNTHESIS_MODEL = AGENT_MODELS["quality"].split("/", 1)[-1]
+
+_streaming_client: Optional[AsyncOpenAI] = None
+
+
+def _get_streaming_client() -> AsyncOpenAI:
+    """Shared async OpenAI client for streamed synthesis (created on first use)"""
+    global _streaming_client
+    if _streaming_client is None:
+        _streaming_client = AsyncOpenAI()
+    return _streaming_client
+
+
+_pipeline_loop: Optional[asyncio.AbstractEventLoop] = None
+_pipeline_loop_lock = threading.Lock()
+
+
+def _get_pipeline_loop() -> asyncio.AbstractEventLoop:
+    """
+    Long-lived event loop (on a daemon thread) that sync callers submit pipeline runs to,
+    instead of paying loop setup per task - also safe when the caller already runs a loop
+    """
+    global _pipeline_loop
+    if _pipeline_loop is None:
+        with _pipeline_loop_lock:
+            if _pipeline_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="controlflow-pipeline", daemon=True).start()
+                _pipeline_loop = loop
+    return _pipeline_loop
+
+
+def _phase_objective(phase: str, **values) -> str:
+    """
+    Task objective: the phase name plus the per-query values as JSON. The phase instructions
+    live in the tenant agent's system prompt (PIPELINE_PHASE_INSTRUCTIONS).
+    """
+    return f"PIPELINE PHASE: {phase}\n{json.dumps(values, default=str)}"
+
+
+def _is_error_result(result: Any) -> bool:
+    """
+    True for an empty result or a failure dict ({"status": "error"} from the tools, or an
+    "error" key) - checked by key, never by scanning the stringified result
+    """
+    if not result:
+        return True
+    return isinstance(result, dict) and (result.get("status") == "error" or bool(result.get("error")))
+
 
 class TaskResult(BaseModel):
     """Result from a ControlFlow task execution"""
@@ -19,126 +85,185 @@ class TaskResult(BaseModel):
     execution_time: float = 0.0
 
 
-def create_query_analysis_task(query_context: QueryContext) -> cf.Task:
+def create_query_analysis_task(query_context: QueryContext, agent: cf.Agent = None) -> cf.Task:
     """
     Task to analyze and validate the user query, extracting entities and determining approach
     """
     return cf.Task(
-        objective=f"""
-        Analyze the user query: "{query_context.user_query}"
-        
-        ANALYSIS REQUIREMENTS:
-        1. Confirm the query classification: {query_context.query_type}
-        2. Validate extracted entities: {query_context.extracted_entities}
-        3. Determine if additional entity extraction is needed
-        4. Plan the execution approach (which tools to use)
-        5. Identify any potential issues or missing information
-        
-        RETURN a detailed analysis plan with:
-        - Confirmed query type
-        - Validated entities and categories
-        - Recommended tool sequence
-        - Any clarifications needed from user
-        """,
+        objective=_phase_objective(
+            "analysis",
+            user_query=query_context.user_query,
+            query_type=query_context.query_type,
+            entities=query_context.extracted_entities
+        ),
         result_type=Dict[str, Any],
-        agents=[create_tenant_agent(query_context.tenant_id)],
+        agents=[agent or create_tenant_agent(query_context.tenant_id, tier="fast")],
         tools=get_tools_for_query_type(query_context.query_type),
     )
 
 
-def create_data_retrieval_task(query_context: QueryContext, analysis_plan: Dict[str, Any]) -> cf.Task:
+def create_data_retrieval_task(
+    query_context: QueryContext,
+    analysis_plan: Dict[str, Any],
+    agent: cf.Agent = None
+) -> cf.Task:
     """
     Task to execute the actual data retrieval based on the analysis plan
     """
     return cf.Task(
-        objective=f"""
-        Execute data retrieval for the user query: "{query_context.user_query}"
-        
-        EXECUTION PLAN: {analysis_plan}
-        QUERY TYPE: {query_context.query_type}
-        ENTITIES: {query_context.extracted_entities}
-        
-        EXECUTION REQUIREMENTS:
-        1. Use the appropriate tools based on the analysis plan
-        2. Ensure proper tenant isolation (tenant_id: {query_context.tenant_id})
-        3. Handle any errors gracefully with fallback approaches
-        4. Collect all relevant data needed for the response
-        5. Validate data quality and completeness
-        
-        RETURN the raw data results ready for response formatting
-        """,
+        objective=_phase_objective(
+            "retrieval",
+            tenant_id=query_context.tenant_id,
+            user_query=query_context.user_query,
+            query_type=query_context.query_type,
+            entities=query_context.extracted_entities,
+            execution_plan=analysis_plan
+        ),
         result_type=Dict[str, Any],
-        agents=[create_tenant_agent(query_context.tenant_id)],
+        agents=[agent or create_tenant_agent(query_context.tenant_id)],
         tools=get_tools_for_query_type(query_context.query_type),
     )
 
 
+def _synthesis_objective(query_context: QueryContext, **raw_data_values) -> str:
+    """Objective of the synthesis phase (shared by the task and the streaming path)"""
+    return _phase_objective(
+        "synthesis",
+        user_query=query_context.user_query,
+        query_type=query_context.query_type,
+        **raw_data_values
+    )
+
+
+def _raw_data_json(raw_data: Any) -> str:
+    return json.dumps(raw_data, default=str)
+
+
+def _create_raw_data_chunk_tool(raw_json: str):
+    """Tool that pages through one synthesis task's raw data"""
+
+    @cf.tool
+    def get_raw_data_chunk(offset: int = 0, size: int = RAW_DATA_CHUNK_CHARS) -> Dict[str, Any]:
+        """
+        Read part of the retrieved raw data (JSON text) starting at offset.
+        Call again with next_offset until has_more is false.
+        """
+        offset = max(0, offset)
+        size = max(1, min(size, RAW_DATA_CHUNK_CHARS))
+        chunk = raw_json[offset:offset + size]
+        next_offset = offset + len(chunk)
+        return {
+            "chunk": chunk,
+            "next_offset": next_offset,
+            "total_length": len(raw_json),
+            "has_more": next_offset < len(raw_json)
+        }
+
+    return get_raw_data_chunk
+
+
 def create_response_synthesis_task(
     query_context: QueryContext, 
-    raw_data: Dict[str, Any]
+    raw_data: Dict[str, Any],
+    agent: cf.Agent = None
 ) -> cf.Task:
     """
     Task to synthesize the raw data into a user-friendly response
     """
+    raw_json = _raw_data_json(raw_data)
+    if len(raw_json) <= RAW_DATA_INLINE_CHARS:
+        raw_data_values = {"raw_data": raw_data}
+        tools = []  # No tools needed for synthesis, just reasoning
+    else:
+        # Large results stay out of the prompt - the agent reads them in chunks on demand
+        raw_data_values = {
+            "raw_data": f"{len(raw_json)} characters of JSON, not included here. Read it with "
+                        f"get_raw_data_chunk(offset, size) (at most {RAW_DATA_CHUNK_CHARS} characters per call).",
+            "raw_data_preview": raw_json[:RAW_DATA_PREVIEW_CHARS]
+        }
+        tools = [_create_raw_data_chunk_tool(raw_json)]
+
     return cf.Task(
-        objective=f"""
-        Synthesize a comprehensive response for the user query: "{query_context.user_query}"
-        
-        RAW DATA: {raw_data}
-        QUERY TYPE: {query_context.query_type}
-        
-        SYNTHESIS REQUIREMENTS:
-        1. Format the response according to query type:
-           - FILTERED_DATA: Present content with clear categorization
-           - ANALYTICS: Provide insights, trends, and key findings
-           - STRATEGIC_ANALYSIS: Include recommendations and reasoning
-           - SEARCH: Rank results by relevance and explain matches
-           - GENERAL_CHAT: Provide helpful, conversational response
-        
-        2. Generate appropriate insights and recommendations if applicable
-        3. Include relevant metadata and context
-        4. Ensure the response is actionable and valuable to the user
-        5. Handle any data limitations or issues transparently
-        
-        RETURN a properly formatted QueryResponse object with:
-        - Clear, user-friendly message
-        - Structured data if applicable  
-        - Insights for analytics queries
-        - Recommendations for strategic queries
-        - Proper metadata and query info
-        """,
+        objective=_synthesis_objective(query_context, **raw_data_values),
         result_type=QueryResponse,
-        agents=[create_tenant_agent(query_context.tenant_id)],
-        tools=[],  # No tools needed for synthesis, just reasoning
+        agents=[agent or create_tenant_agent(query_context.tenant_id)],
+        tools=tools,
+    )
+
+
+# Query types answered by one retrieve-and-respond task instead of analysis → retrieval → synthesis
+DIRECT_RESPONSE_GUIDANCE = {
+    "SIMPLE_FILTER": "Use filter_content_by_categories to find matching content "
+                     "(validate unclear values with validate_category_values first).",
+    "COUNT_ANALYTICS": "Use count_content_by_criteria (or analyze_content_distribution for per-category counts) "
+                       "and report the exact numbers.",
+    "SEARCH": "Use search_content_by_text to find relevant content; rank results by relevance and explain each match.",
+}
+
+
+# Query types answered by a Python template when their filters were fully extracted
+TEMPLATED_QUERY_TYPES = ("COUNT_ANALYTICS", "SIMPLE_FILTER")
+TEMPLATED_LIST_LIMIT = 30
+
+
+def create_direct_response_task(query_context: QueryContext, agent: cf.Agent = None) -> cf.Task:
+    """
+    Single task that retrieves the data and writes the final response - used for query
+    types whose tool sequence is already clear from the classification.
+    """
+    return cf.Task(
+        objective=_phase_objective(
+            "direct",
+            guidance=DIRECT_RESPONSE_GUIDANCE[query_context.query_type],
+            tenant_id=query_context.tenant_id,
+            user_query=query_context.user_query,
+            query_type=query_context.query_type,
+            entities=query_context.extracted_entities
+        ),
+        result_type=QueryResponse,
+        agents=[agent or create_tenant_agent(query_context.tenant_id)],
+        tools=get_tools_for_query_type(query_context.query_type),
+    )
+
+
+def create_batched_response_task(query_contexts: List[QueryContext], agent: cf.Agent = None) -> cf.Task:
+    """
+    Direct-answer task for several queries of the same tenant and query type, answered in one
+    LLM call. Returns one QueryResponse per query, in the order given.
+    """
+    first = query_contexts[0]
+    return cf.Task(
+        objective=_phase_objective(
+            "batch",
+            guidance=DIRECT_RESPONSE_GUIDANCE[first.query_type],
+            tenant_id=first.tenant_id,
+            query_type=first.query_type,
+            queries=[{"user_query": ctx.user_query, "entities": ctx.extracted_entities} for ctx in query_contexts]
+        ),
+        result_type=List[QueryResponse],
+        agents=[agent or create_tenant_agent(first.tenant_id)],
+        tools=get_tools_for_query_type(first.query_type),
     )
 
 
 def create_error_handling_task(
     query_context: QueryContext, 
     error: Exception, 
-    attempted_approach: str
+    attempted_approach: str,
+    agent: cf.Agent = None
 ) -> cf.Task:
     """
     Task to handle errors gracefully and provide helpful fallback responses
     """
     return cf.Task(
-        objective=f"""
-        Handle the error that occurred while processing: "{query_context.user_query}"
-        
-        ERROR: {str(error)}
-        ATTEMPTED APPROACH: {attempted_approach}
-        
-        ERROR HANDLING REQUIREMENTS:
-        1. Analyze what went wrong and why
-        2. Determine if a fallback approach is possible
-        3. Provide a helpful error message to the user
-        4. Suggest alternative queries if appropriate
-        5. Ensure the user understands what data is available
-        
-        RETURN a user-friendly error response with suggestions for next steps
-        """,
+        objective=_phase_objective(
+            "error",
+            user_query=query_context.user_query,
+            error=str(error),
+            attempted_approach=attempted_approach
+        ),
         result_type=QueryResponse,
-        agents=[create_tenant_agent(query_context.tenant_id)],
+        agents=[agent or create_tenant_agent(query_context.tenant_id, tier="fast")],
         tools=[
             # Import these at module level to avoid circular imports
             # get_tenant_schema_info, get_content_summary_stats
@@ -146,12 +271,97 @@ def create_error_handling_task(
     )
 
 
+class TaskResultCache:
+    """
+    Exact-input cache for task results. The key is a SHA-256 of the task's objective, tool
+    names, agents and tenant, so only literally repeated inputs hit (dashboards, polling,
+    retries); the semantic QueryResponseCache handles paraphrases.
+    """
+
+    def __init__(self, ttl_seconds: int = 3600, max_entries: int = 2048):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, Any]] = {}  # key -> (created_at, result)
+
+    @staticmethod
+    def key(task: cf.Task, tenant_id: str) -> str:
+        payload = {
+            "objective": task.objective,
+            "tools": sorted(getattr(tool, "name", getattr(tool, "__name__", str(tool))) for tool in task.tools),
+            "agents": [agent.name for agent in task.agents or []],
+            "result_type": str(task.result_type),
+            "tenant": tenant_id,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None or time.time() - entry[0] >= self.ttl_seconds:
+            return False, None
+        return True, copy.deepcopy(entry[1])
+
+    def set(self, key: str, result: Any):
+        if _is_error_result(result) or getattr(result, "response_type", None) == "error":
+            return  # failures are retried, never replayed
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))  # drop the oldest entry
+            self._entries[key] = (time.time(), copy.deepcopy(result))
+
+
+task_result_cache = TaskResultCache()
+
+
+class AnalysisPlanCache:
+    """
+    Analysis plans keyed by query shape: tenant, query type and which categories / search
+    terms / modifiers were extracted - not their values. The plan is structural, so queries
+    of a known shape skip the analysis phase; the current query's entities replace the
+    cached plan's validated_entities on every hit.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._plans: Dict[tuple, Dict[str, Any]] = {}
+
+    @staticmethod
+    def key(query_context: QueryContext) -> tuple:
+        entities = query_context.extracted_entities
+        return (
+            query_context.tenant_id,
+            query_context.query_type,
+            tuple(sorted(entities.get("categories", {}))),
+            bool(entities.get("search_terms")),
+            tuple(sorted(entities.get("modifiers", []))),
+        )
+
+    def get(self, query_context: QueryContext) -> Optional[Dict[str, Any]]:
+        plan = self._plans.get(self.key(query_context))
+        if plan is None:
+            return None
+        return {**copy.deepcopy(plan), "validated_entities": query_context.extracted_entities}
+
+    def set(self, query_context: QueryContext, plan: Any):
+        if not isinstance(plan, dict) or _is_error_result(plan):
+            return
+        with self._lock:
+            if len(self._plans) >= self.max_entries:
+                self._plans.pop(next(iter(self._plans)))  # drop the oldest entry
+            self._plans[self.key(query_context)] = copy.deepcopy(plan)
+
+
+analysis_plan_cache = AnalysisPlanCache()
+
+
 class ControlFlowPipeline:
     """Main pipeline orchestrator for query processing"""
     
     def __init__(self, tenant_id: str):
         self.tenant_id = tenant_id
         self.agent = create_tenant_agent(tenant_id)
+        self.fast_agent = create_tenant_agent(tenant_id, tier="fast")  # analysis and error handling
     
     async def process_query(self, query_context: QueryContext) -> QueryResponse:
         """
@@ -160,22 +370,23 @@ class ControlFlowPipeline:
         try:
             logger.info(f"Processing query: {query_context.user_query}", extra={"tenant_id": self.tenant_id})
             
-            # Phase 1: Query Analysis and Planning
-            analysis_task = create_query_analysis_task(query_context)
-            analysis_result = await analysis_task.run_async()
+            # Counts and lists with resolved filters: answered from the database, no LLM call
+            templated = await self._templated_response(query_context)
+            if templated is not None:
+                return templated
             
-            if not analysis_result or "error" in str(analysis_result):
-                return await self._handle_analysis_error(query_context, analysis_result)
+            # Clear-cut query types: one LLM task instead of three
+            if query_context.query_type in DIRECT_RESPONSE_GUIDANCE:
+                direct_result = await self._run_cached(create_direct_response_task(query_context, self.agent))
+                return self._as_query_response(query_context, direct_result, ["direct"])
             
-            # Phase 2: Data Retrieval
-            retrieval_task = create_data_retrieval_task(query_context, analysis_result)
-            raw_data = await retrieval_task.run_async()
-            
-            if not raw_data or "error" in str(raw_data):
-                return await self._handle_retrieval_error(query_context, raw_data)
+            # Phases 1 + 2: Analysis and Data Retrieval
+            raw_data, error_response = await self._analyze_and_retrieve(query_context)
+            if error_response is not None:
+                return error_response
             
             # Phase 3: Response Synthesis
-            synthesis_task = create_response_synthesis_task(query_context, raw_data)
+            synthesis_task = create_response_synthesis_task(query_context, raw_data, self.agent)
             final_response = await synthesis_task.run_async()
             
             if not isinstance(final_response, QueryResponse):
@@ -198,88 +409,220 @@ class ControlFlowPipeline:
             logger.error(f"Pipeline error: {e}", extra={"tenant_id": self.tenant_id})
             return await self._handle_pipeline_error(query_context, e)
     
-    def process_query_sync(self, query_context: QueryContext) -> QueryResponse:
+    async def stream_query(self, query_context: QueryContext) -> AsyncIterator[Union[str, QueryResponse]]:
         """
-        Synchronous version of query processing for easier integration
+        Streaming version of process_query: yields the response message as text chunks while
+        the synthesis phase writes it, then the complete QueryResponse (data, metadata) last.
         """
         try:
-            logger.info(f"Processing query (sync): {query_context.user_query}", extra={"tenant_id": self.tenant_id})
-            
-            # Phase 1: Query Analysis and Planning
-            analysis_task = create_query_analysis_task(query_context)
-            analysis_result = analysis_task.run()
-            
-            if not analysis_result or "error" in str(analysis_result):
-                return self._handle_analysis_error_sync(query_context, analysis_result)
-            
-            # Phase 2: Data Retrieval
-            retrieval_task = create_data_retrieval_task(query_context, analysis_result)
-            raw_data = retrieval_task.run()
-            
-            if not raw_data or "error" in str(raw_data):
-                return self._handle_retrieval_error_sync(query_context, raw_data)
-            
-            # Phase 3: Response Synthesis
-            synthesis_task = create_response_synthesis_task(query_context, raw_data)
-            final_response = synthesis_task.run()
-            
-            if not isinstance(final_response, QueryResponse):
-                # Convert to proper format if needed
-                final_response = QueryResponse(
-                    response_type=query_context.query_type.lower().replace("_", "_"),
-                    message=str(final_response),
-                    metadata={"processing_phases": ["analysis", "retrieval", "synthesis"]}
-                )
-            
-            logger.info(f"Query processed successfully (sync)", extra={
-                "tenant_id": self.tenant_id,
-                "query_type": query_context.query_type,
-                "confidence": query_context.confidence_score
-            })
-            
-            return final_response
+            if query_context.query_type in DIRECT_RESPONSE_GUIDANCE:
+                response = await self.process_query(query_context)
+                yield response.message
+                yield response
+                return
             
+            raw_data, error_response = await self._analyze_and_retrieve(query_context)
         except Exception as e:
+            logger.error(f"Pipeline error: {e}", extra={"tenant_id": self.tenant_id})
+            error_response = await self._handle_pipeline_error(query_context, e)
+        
+        if error_response is not None:
+            yield error_response.message
+            yield error_response
+            return
+        
+        # Phase 3: Response Synthesis, streamed token by token. Errors from here on reach the
+        # caller - a partially shown answer can't be swapped for an error response
+        message_parts = []
+        async for chunk in self._stream_synthesis(query_context, raw_data):
+            message_parts.append(chunk)
+            yield chunk
+        
+        data = raw_data.get("data") if isinstance(raw_data, dict) else None
+        yield QueryResponse(
+            response_type=query_context.query_type.lower(),
+            message="".join(message_parts),
+            data=data if isinstance(data, list) else None,
+            metadata={"processing_phases": ["analysis", "retrieval", "synthesis"], "streamed": True}
+        )
+    
+    def process_query_sync(self, query_context: QueryContext) -> QueryResponse:
+        """
+        Synchronous version of query processing for easier integration - runs process_query
+        on the shared pipeline event loop, so both entry points take the same code path
+        """
+        try:
+            return asyncio.run_coroutine_threadsafe(
+                self.process_query(query_context), _get_pipeline_loop()
+            ).result()
+        except Exception as e:
+            # process_query only raises when its own error handling fails (e.g. the LLM is down)
             logger.error(f"Pipeline error (sync): {e}", extra={"tenant_id": self.tenant_id})
             return self._handle_pipeline_error_sync(query_context, e)
     
+    async def _templated_response(self, query_context: QueryContext) -> Optional[QueryResponse]:
+        """
+        Python-formatted answer for COUNT_ANALYTICS and SIMPLE_FILTER queries whose filters were
+        fully extracted. Returns None (use the LLM path) when there are no filters, when the
+        query asks for anything the filters don't capture, or when nothing matches, since the
+        LLM can then suggest alternatives.
+        """
+        entities = query_context.extracted_entities
+        filters = entities.get("categories")
+        if not filters or query_context.query_type not in TEMPLATED_QUERY_TYPES:
+            return None
+        # Modifiers ("recent", "top") and leftover words ("about crypto", "per funnel stage") change
+        # the answer - only a request that is nothing but its filters is templated (a missing
+        # unmatched_terms list means it was never computed, so don't assume)
+        if entities.get("modifiers") or entities.get("unmatched_terms") != []:
+            return None
+        
+        criteria = " and ".join(
+            f"{name}: {', '.join(values) if isinstance(values, list) else values}" for name, values in filters.items()
+        )
+        query_info = {"query_type": query_context.query_type, "filters": filters}
+        metadata = {"processing_phases": ["templated"]}
+        
+        if query_context.query_type == "COUNT_ANALYTICS":
+            count = await asyncio.to_thread(fetch_content_count, query_context.tenant_id, filters)
+            if not count:
+                return None
+            return QueryResponse(
+                response_type="analytics",
+                message=f"There are {count} content items with {criteria}.",
+                data=[{"count": count, "filters": filters}],
+                metadata=metadata,
+                query_info=query_info
+            )
+        
+        items = await asyncio.to_thread(
+            fetch_content_by_filters, query_context.tenant_id, filters, TEMPLATED_LIST_LIMIT
+        )
+        if not items:
+            return None
+        shown = f" (showing the first {TEMPLATED_LIST_LIMIT})" if len(items) == TEMPLATED_LIST_LIMIT else ""
+        return QueryResponse(
+            response_type="filtered_data",
+            message=f"Here are {len(items)} content items with {criteria}{shown}.",
+            data=items,
+            metadata=metadata,
+            query_info=query_info
+        )
+    
+    async def _analyze_and_retrieve(self, query_context: QueryContext) -> Tuple[Any, Optional[QueryResponse]]:
+        """
+        Run the analysis phase alongside a speculative retrieval planned from the classification
+        alone; retrieval is replayed only if analysis disagrees or it failed.
+        Returns (raw_data, None) on success or (None, error_response).
+        """
+        # Known query shape: reuse its plan and skip the analysis phase
+        cached_plan = analysis_plan_cache.get(query_context)
+        if cached_plan is not None:
+            raw_data = await self._run_cached(create_data_retrieval_task(query_context, cached_plan, self.agent))
+            if not _is_error_result(raw_data):
+                return raw_data, None
+        
+        analysis_task = create_query_analysis_task(query_context, self.fast_agent)
+        speculative_task = create_data_retrieval_task(query_context, self._default_plan(query_context), self.agent)
+        analysis_result, raw_data = await asyncio.gather(
+            self._run_cached(analysis_task), self._run_cached(speculative_task), return_exceptions=True
+        )
+        if isinstance(analysis_result, Exception):
+            raise analysis_result
+        
+        if _is_error_result(analysis_result):
+            return None, await self._handle_analysis_error(query_context, analysis_result)
+        
+        if self._plan_confirms_classification(query_context, analysis_result):
+            analysis_plan_cache.set(query_context, analysis_result)
+        
+        if (isinstance(raw_data, Exception) or _is_error_result(raw_data)
+                or not self._plan_confirms_classification(query_context, analysis_result)):
+            retrieval_task = create_data_retrieval_task(query_context, analysis_result, self.agent)
+            raw_data = await self._run_cached(retrieval_task)
+        
+        if _is_error_result(raw_data):
+            return None, await self._handle_retrieval_error(query_context, raw_data)
+        
+        return raw_data, None
+    
+    async def _stream_synthesis(self, query_context: QueryContext, raw_data: Any) -> AsyncIterator[str]:
+        """
+        Synthesis phase as a streamed chat completion (same objective and agent instructions
+        as the synthesis task, but asking for the message text only)
+        """
+        stream = await _get_streaming_client().chat.completions.create(
+            model=STREAMING_SYNTHESIS_MODEL,
+            messages=[
+                {"role": "system", "content": self.agent.instructions},
+                {"role": "user", "content": _synthesis_objective(query_context, raw_data=raw_data)
+                 + "\nOUTPUT: write only the user-facing message (markdown), not a JSON object."}
+            ],
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    async def _run_cached(self, task: cf.Task) -> Any:
+        """run_async() through the exact-input task cache"""
+        key = task_result_cache.key(task, self.tenant_id)
+        hit, result = task_result_cache.get(key)
+        if hit:
+            return result
+        result = await task.run_async()
+        task_result_cache.set(key, result)
+        return result
+    
+    def _default_plan(self, query_context: QueryContext) -> Dict[str, Any]:
+        """Execution plan implied by the classifier alone (used for speculative retrieval)"""
+        return {
+            "confirmed_query_type": query_context.query_type,
+            "validated_entities": query_context.extracted_entities,
+            "recommended_tools": [getattr(tool, "name", getattr(tool, "__name__", str(tool)))
+                                  for tool in get_tools_for_query_type(query_context.query_type)],
+        }
+    
+    def _plan_confirms_classification(self, query_context: QueryContext, analysis_result: Any) -> bool:
+        """True unless the analysis plan names a different query type than the classifier"""
+        if not isinstance(analysis_result, dict):
+            return True
+        confirmed = analysis_result.get("confirmed_query_type") or analysis_result.get("query_type")
+        return not confirmed or str(confirmed).upper() == query_context.query_type
+    
+    def _as_query_response(self, query_context: QueryContext, result: Any, phases: List[str]) -> QueryResponse:
+        """Wrap a task result that isn't already a QueryResponse"""
+        if isinstance(result, QueryResponse):
+            return result
+        return QueryResponse(
+            response_type=query_context.query_type.lower(),
+            message=str(result),
+            metadata={"processing_phases": phases}
+        )
+    
     async def _handle_analysis_error(self, query_context: QueryContext, error_result: Any) -> QueryResponse:
         """Handle errors during query analysis phase"""
         error_task = create_error_handling_task(
             query_context, 
             Exception(str(error_result)), 
-            "query_analysis"
+            "query_analysis",
+            self.fast_agent
         )
         return await error_task.run_async()
     
-    def _handle_analysis_error_sync(self, query_context: QueryContext, error_result: Any) -> QueryResponse:
-        """Handle errors during query analysis phase (sync)"""
-        return QueryResponse(
-            response_type="error",
-            message=f"I had trouble understanding your query. Could you try rephrasing it? For example: 'Show me TOFU content' or 'How many Product Pages do we have?'",
-            metadata={"error_phase": "analysis", "original_query": query_context.user_query}
-        )
-    
     async def _handle_retrieval_error(self, query_context: QueryContext, error_result: Any) -> QueryResponse:
         """Handle errors during data retrieval phase"""
         error_task = create_error_handling_task(
             query_context,
             Exception(str(error_result)),
-            "data_retrieval" 
+            "data_retrieval",
+            self.fast_agent
         )
         return await error_task.run_async()
     
-    def _handle_retrieval_error_sync(self, query_context: QueryContext, error_result: Any) -> QueryResponse:
-        """Handle errors during data retrieval phase (sync)"""
-        return QueryResponse(
-            response_type="error",
-            message=f"I encountered an issue retrieving the data. This might be due to invalid filters or a temporary system issue. Please try a simpler query.",
-            metadata={"error_phase": "retrieval", "original_query": query_context.user_query}
-        )
-    
     async def _handle_pipeline_error(self, query_context: QueryContext, error: Exception) -> QueryResponse:
         """Handle general pipeline errors"""
-        error_task = create_error_handling_task(query_context, error, "pipeline")
+        error_task = create_error_handling_task(query_context, error, "pipeline", self.fast_agent)
         return await error_task.run_async()
     
     def _handle_pipeline_error_sync(self, query_context: QueryContext, error: Exception) -> QueryResponse:
@@ -291,85 +634,205 @@ class ControlFlowPipeline:
         )
 
 
+class QueryBatcher:
+    """
+    Micro-batcher for concurrent direct-answer queries. Queries for the same
+    (tenant_id, query_type) that arrive within window_ms of each other are answered by a
+    single batched task; each caller still awaits its own QueryResponse.
+    """
+
+    def __init__(self, window_ms: int = 30, max_batch_size: int = 8):
+        self.window_seconds = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[tuple, Dict[str, Any]] = {}
+
+    async def submit(self, query_context: QueryContext) -> QueryResponse:
+        """Queue a query for the next batch of its key and wait for its response"""
+        if query_context.query_type not in DIRECT_RESPONSE_GUIDANCE:
+            # Multi-phase query types don't collapse into one task
+            return await ControlFlowPipeline(query_context.tenant_id).process_query(query_context)
+
+        # Templated answers need no LLM call, so there is nothing to batch
+        templated = await ControlFlowPipeline(query_context.tenant_id)._templated_response(query_context)
+        if templated is not None:
+            return templated
+
+        loop = asyncio.get_running_loop()
+        key = (query_context.tenant_id, query_context.query_type)
+        future = loop.create_future()
+
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = {"items": []}
+            batch["timer"] = loop.call_later(self.window_seconds, self._schedule_flush, key)
+        batch["items"].append((query_context, future))
+
+        if len(batch["items"]) >= self.max_batch_size:
+            batch["timer"].cancel()
+            self._schedule_flush(key)
+
+        return await future
+
+    def _schedule_flush(self, key: tuple) -> None:
+        batch = self._pending.pop(key, None)
+        if batch:
+            asyncio.ensure_future(self._flush(batch["items"]))
+
+    async def _flush(self, items: List[tuple]) -> None:
+        contexts = [ctx for ctx, _ in items]
+        # One pipeline (and its agents) serves the batch and any per-query fallback
+        pipeline = ControlFlowPipeline(contexts[0].tenant_id)
+        try:
+            if len(contexts) == 1:
+                responses = [await pipeline.process_query(contexts[0])]
+            else:
+                responses = await create_batched_response_task(contexts, pipeline.agent).run_async()
+                if not isinstance(responses, list) or len(responses) != len(contexts):
+                    raise ValueError(f"Batched task returned {len(responses) if isinstance(responses, list) else 'non-list'} "
+                                     f"responses for {len(contexts)} queries")
+                logger.info(f"Answered {len(contexts)} {contexts[0].query_type} queries in one batched task")
+        except Exception as e:
+            logger.warning(f"Batched answer failed, answering {len(contexts)} queries individually: {e}")
+            responses = await asyncio.gather(
+                *(pipeline.process_query(ctx) for ctx in contexts), return_exceptions=True
+            )
+
+        for (ctx, future), response in zip(items, responses):
+            if future.done():
+                continue
+            if isinstance(response, BaseException):
+                future.set_exception(response)
+            else:
+                future.set_result(response)
+
+
+class QueryResponseCache:
+    """
+    Reuses final QueryResponses for paraphrased queries ("show me TOFU content" / "list TOFU pages").
+
+    A hit needs the same tenant, query type, extracted categories, modifiers and search terms,
+    plus cosine similarity >= threshold between sentence embeddings of the queries - so
+    "show TOFU" never returns the response cached for "show BOFU", nor "show recent TOFU" the
+    unsorted one. Entries expire after ttl_seconds (content changes).
+    """
+
+    def __init__(self, threshold: float = 0.92, ttl_seconds: int = 600, max_entries_per_tenant: int = 512):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries_per_tenant = max_entries_per_tenant
+        self._lock = threading.Lock()
+        # tenant_id -> (embedding matrix, [(guard key, created_at, response)])
+        self._entries: Dict[str, Tuple[np.ndarray, List[Tuple[str, float, QueryResponse]]]] = {}
+
+    @staticmethod
+    def _embed(user_query: str) -> Optional[np.ndarray]:
+        encoder = _get_value_encoder()
+        if encoder is None:
+            return None
+        return encoder.encode(" ".join(user_query.lower().split()), normalize_embeddings=True)
+
+    @staticmethod
+    def _guard_key(query_context: QueryContext) -> str:
+        entities = query_context.extracted_entities
+        return json.dumps([
+            query_context.query_type,
+            entities.get("categories", {}),
+            sorted(entities.get("modifiers", [])),
+            sorted(entities.get("search_terms", [])),
+        ], sort_keys=True, default=str)
+
+    def lookup(self, query_context: QueryContext) -> Tuple[Optional[QueryResponse], Optional[np.ndarray]]:
+        """Return (cached response or None, query embedding) - the embedding is reused by add()"""
+        embedding = self._embed(query_context.user_query)
+        entry = self._entries.get(query_context.tenant_id)
+        if embedding is None or entry is None:
+            return None, embedding
+
+        matrix, results = entry
+        similarities = matrix @ embedding
+        guard_key = self._guard_key(query_context)
+        now = time.time()
+        for index in np.argsort(-similarities):
+            if similarities[index] < self.threshold:
+                break
+            key, created_at, response = results[index]
+            if key == guard_key and now - created_at < self.ttl_seconds:
+                return response.model_copy(deep=True), embedding
+        return None, embedding
+
+    def add(self, query_context: QueryContext, embedding: Optional[np.ndarray], response: QueryResponse):
+        if embedding is None or response.response_type == "error":
+            return
+        with self._lock:
+            matrix, results = self._entries.get(
+                query_context.tenant_id, (np.empty((0, embedding.shape[0]), dtype=embedding.dtype), [])
+            )
+            if len(results) >= self.max_entries_per_tenant:
+                matrix, results = matrix[1:], results[1:]  # drop the oldest entry
+            self._entries[query_context.tenant_id] = (
+                np.vstack([matrix, embedding]),
+                results + [(self._guard_key(query_context), time.time(), response.model_copy(deep=True))]
+            )
+
+
+response_cache = QueryResponseCache()
+
+
 # Convenience functions for easy integration
 def process_user_query(tenant_id: str, user_query: str) -> QueryResponse:
     """
     Simple function to process a user query - main entry point for the chatbot
     """
-    from controlflow_core.agent import create_query_context
-    
     # Create query context
     query_context = create_query_context(tenant_id=str(tenant_id), user_query=user_query)
     
+    # Near-duplicate of a recent query: skip the pipeline entirely
+    cached, embedding = response_cache.lookup(query_context)
+    if cached is not None:
+        logger.info("Query response served from semantic cache", extra={"tenant_id": tenant_id})
+        return cached
+    
     # Process through pipeline
     pipeline = ControlFlowPipeline(tenant_id)
-    return pipeline.process_query_sync(query_context)
+    response = pipeline.process_query_sync(query_context)
+    response_cache.add(query_context, embedding, response)
+    return response
 
 
-async def process_user_query_async(tenant_id: str, user_query: str) -> QueryResponse:
+async def stream_user_query_async(tenant_id: str, user_query: str) -> AsyncIterator[Union[str, QueryResponse]]:
     """
-    Async version of query processing
+    Streaming query processing: yields the response message as text chunks as soon as they
+    are generated, then the complete QueryResponse (structured data and metadata) last
     """
-    from controlflow_core.agent import create_query_context
-    
-    # Create query context
     query_context = create_query_context(tenant_id=str(tenant_id), user_query=user_query)
-    
-    # Process through pipeline
     pipeline = ControlFlowPipeline(tenant_id)
-    return await pipeline.process_query(query_context)
+    async for item in pipeline.stream_query(query_context):
+        yield item
 
 
-# Task factory functions for specific query types
-def create_simple_filter_task(tenant_id: str, user_query: str, entities: Dict) -> cf.Task:
-    """Create optimized task for simple filtering queries"""
-    return cf.Task(
-        objective=f"""
-        Handle simple content filtering query: "{user_query}"
-        
-        Extracted entities: {entities}
-        
-        TASK: Use filter_content_by_categories tool to find matching content.
-        If entities are unclear, validate them first using validate_category_values.
-        Return results in a user-friendly format with clear categorization.
-        """,
-        result_type=Dict[str, Any],
-        agents=[create_tenant_agent(tenant_id)],
-        tools=get_tools_for_query_type("SIMPLE_FILTER")
-    )
-
+async def process_user_query_async(
+    tenant_id: str,
+    user_query: str,
+    batcher: QueryBatcher = None
+) -> QueryResponse:
+    """
+    Async version of query processing. Pass a shared QueryBatcher to coalesce concurrent
+    direct-answer queries into batched LLM calls.
+    """
+    # Create query context
+    query_context = create_query_context(tenant_id=str(tenant_id), user_query=user_query)
 
-def create_analytics_task(tenant_id: str, user_query: str, entities: Dict) -> cf.Task:
-    """Create optimized task for analytics queries"""
-    return cf.Task(
-        objective=f"""
-        Handle analytics query: "{user_query}"
-        
-        Extracted entities: {entities}
-        
-        TASK: Use analyze_content_distribution or count_content_by_criteria to provide insights.
-        Include specific numbers, trends, and examples in your response.
-        Make the analysis actionable and valuable.
-        """,
-        result_type=Dict[str, Any],
-        agents=[create_tenant_agent(tenant_id)],
-        tools=get_tools_for_query_type("DISTRIBUTION_ANALYTICS")
-    )
+    cached, embedding = await asyncio.to_thread(response_cache.lookup, query_context)
+    if cached is not None:
+        logger.info("Query response served from semantic cache", extra={"tenant_id": tenant_id})
+        return cached
 
+    if batcher is not None:
+        response = await batcher.submit(query_context)
+    else:
+        # Process through pipeline
+        pipeline = ControlFlowPipeline(tenant_id)
+        response = await pipeline.process_query(query_context)
 
-def create_search_task(tenant_id: str, user_query: str, entities: Dict) -> cf.Task:
-    """Create optimized task for search queries"""
-    return cf.Task(
-        objective=f"""
-        Handle search query: "{user_query}"
-        
-        Search terms: {entities.get('search_terms', [])}
-        
-        TASK: Use search_content_by_text to find relevant content.
-        Rank results by relevance and explain why each result matches.
-        Include both content text matches and category matches.
-        """,
-        result_type=Dict[str, Any],
-        agents=[create_tenant_agent(tenant_id)],
-        tools=get_tools_for_query_type("SEARCH")
-    )
\ No newline at end of file
+    response_cache.add(query_context, embedding, response)
+    return response
@@ -1,6 +1,8 @@
 # controlflow_core/tools.py - ControlFlow Tools that wrap database functions
 
 import controlflow as cf
+from concurrent.futures import ThreadPoolExecutor
+from difflib import get_close_matches
 from typing import Dict, List, Any, Optional, Union
 from database.queries import (
     fetch_content,
@@ -9,13 +11,17 @@ from database.queries import (
     fetch_distribution_analysis,
     fetch_content_gap_analysis,
     search_content_by_text,
-    fetch_content_count
+    fetch_content_count,
+    fetch_content_multi_search
 )
-from database.extractor import DynamicTenantSchemaExtractor
+from controlflow_core.agent import get_tenant_schema
 from utils.logger import get_logger
 
 logger = get_logger("controlflow_tools")
 
+# Shared pool for fanning out independent, IO-bound database calls within a tool
+_SUMMARY_EXECUTOR = ThreadPoolExecutor(max_workers=6, thread_name_prefix="summary-stats")
+
 
 @cf.tool
 def get_tenant_schema_info(tenant_id: str) -> Dict[str, Any]:
@@ -24,8 +30,8 @@ def get_tenant_schema_info(tenant_id: str) -> Dict[str, Any]:
     Use this to understand what data is available for filtering and analysis.
     """
     try:
-        extractor = DynamicTenantSchemaExtractor(tenant_id)
-        schema = extractor.extract_schema()
+        # TTL-cached per tenant - shared by every tool call and pipeline phase
+        schema = get_tenant_schema(tenant_id)
         
         return {
             "tenant_id": tenant_id,
@@ -37,7 +43,7 @@ def get_tenant_schema_info(tenant_id: str) -> Dict[str, Any]:
         }
     except Exception as e:
         logger.error(f"Failed to get schema info: {e}")
-        return {"error": str(e), "tenant_id": tenant_id}
+        return {"status": "error", "error": str(e), "tenant_id": tenant_id}
 
 
 @cf.tool
@@ -58,7 +64,7 @@ def fetch_basic_content(tenant_id: str, limit: int = 20, skip: int = 0) -> Dict[
         }
     except Exception as e:
         logger.error(f"Failed to fetch basic content: {e}")
-        return {"error": str(e), "operation": "basic_content_fetch"}
+        return {"status": "error", "error": str(e), "operation": "basic_content_fetch"}
 
 
 @cf.tool
@@ -93,7 +99,7 @@ def filter_content_by_categories(
         }
     except Exception as e:
         logger.error(f"Failed to filter content: {e}")
-        return {"error": str(e), "filters_applied": category_filters}
+        return {"status": "error", "error": str(e), "filters_applied": category_filters}
 
 
 @cf.tool
@@ -125,7 +131,7 @@ def filter_content_with_complex_criteria(
         return results
     except Exception as e:
         logger.error(f"Failed complex filtering: {e}")
-        return {"error": str(e), "category_filters": category_filters}
+        return {"status": "error", "error": str(e), "category_filters": category_filters}
 
 
 @cf.tool
@@ -147,7 +153,7 @@ def count_content_by_criteria(
         }
     except Exception as e:
         logger.error(f"Failed to count content: {e}")
-        return {"error": str(e), "filters": filters}
+        return {"status": "error", "error": str(e), "filters": filters}
 
 
 @cf.tool
@@ -177,7 +183,7 @@ def analyze_content_distribution(
         return results
     except Exception as e:
         logger.error(f"Failed distribution analysis: {e}")
-        return {"error": str(e), "primary_field": primary_field}
+        return {"status": "error", "error": str(e), "primary_field": primary_field}
 
 
 @cf.tool
@@ -206,7 +212,7 @@ def analyze_content_gaps(
         return results
     except Exception as e:
         logger.error(f"Failed gap analysis: {e}")
-        return {"error": str(e), "primary_dimension": primary_dimension}
+        return {"status": "error", "error": str(e), "primary_dimension": primary_dimension}
 
 
 @cf.tool  
@@ -244,7 +250,32 @@ def search_content_by_text(
         return results
     except Exception as e:
         logger.error(f"Failed text search: {e}")
-        return {"error": str(e), "search_query": search_query}
+        return {"status": "error", "error": str(e), "search_query": search_query}
+
+
+@cf.tool
+def search_content_multi(
+    tenant_id: str,
+    search_queries: List[str],
+    search_fields: List[str] = ["description", "summary", "readerBenefit", "name"],
+    limit_per_query: int = 10
+) -> Dict[str, Any]:
+    """
+    Search content for several phrasings or synonyms at once (one database round-trip).
+    
+    Use this instead of calling search_content_by_text repeatedly, e.g. for
+    ['crypto', 'cryptocurrency', 'bitcoin']. Returns results grouped per query.
+    """
+    try:
+        return fetch_content_multi_search(
+            tenant_id=tenant_id,
+            search_queries=search_queries,
+            search_fields=search_fields,
+            limit_per_query=limit_per_query
+        )
+    except Exception as e:
+        logger.error(f"Failed multi-query text search: {e}")
+        return {"status": "error", "error": str(e), "search_queries": search_queries}
 
 
 @cf.tool
@@ -254,8 +285,7 @@ def validate_category_values(tenant_id: str, category_name: str, values: List[st
     Use this when you're unsure if user-mentioned categories or values are valid.
     """
     try:
-        extractor = DynamicTenantSchemaExtractor(tenant_id)
-        schema = extractor.extract_schema()
+        schema = get_tenant_schema(tenant_id)
         
         if category_name not in schema.categories:
             return {
@@ -267,19 +297,29 @@ def validate_category_values(tenant_id: str, category_name: str, values: List[st
         valid_values = []
         invalid_values = []
         available_values = schema.categories[category_name]
+        available_set = set(available_values)
         
         for value in values:
-            if value in available_values:
+            if value in available_set:
                 valid_values.append(value)
             else:
                 invalid_values.append(value)
         
-        # Suggest similar values for invalid ones
+        # Suggest similar values for invalid ones - lowercase the available values once,
+        # not once per invalid value
         suggestions = {}
-        for invalid_value in invalid_values:
-            similar = [v for v in available_values if invalid_value.lower() in v.lower() or v.lower() in invalid_value.lower()]
-            if similar:
-                suggestions[invalid_value] = similar[:3]
+        if invalid_values:
+            avail_lower = [(v, v.lower()) for v in available_values]
+            lower_to_value = {lower: v for v, lower in reversed(avail_lower)}
+            for invalid_value in invalid_values:
+                invalid_lower = invalid_value.lower()
+                similar = [v for v, lower in avail_lower if invalid_lower in lower or lower in invalid_lower]
+                if not similar:
+                    # No substring overlap (typos) - fall back to edit-distance matching
+                    close = get_close_matches(invalid_lower, lower_to_value.keys(), n=3, cutoff=0.6)
+                    similar = [lower_to_value[lower] for lower in close]
+                if similar:
+                    suggestions[invalid_value] = similar[:3]
         
         return {
             "valid": len(invalid_values) == 0,
@@ -291,7 +331,7 @@ def validate_category_values(tenant_id: str, category_name: str, values: List[st
         }
     except Exception as e:
         logger.error(f"Failed to validate category values: {e}")
-        return {"error": str(e), "category_name": category_name}
+        return {"status": "error", "error": str(e), "category_name": category_name}
 
 
 @cf.tool
@@ -301,14 +341,17 @@ def get_content_summary_stats(tenant_id: str) -> Dict[str, Any]:
     Use this for general overview queries or when user asks 'what data do you have?'
     """
     try:
-        # Get basic counts
-        total_count = fetch_content_count(tenant_id)
-        
-        # Get funnel distribution
-        funnel_dist = analyze_content_distribution(tenant_id, "Funnel Stage", include_examples=False)
+        # Counts, funnel distribution and schema info are independent Mongo round-trips -
+        # run them concurrently so the wall time is the slowest one, not the sum
+        count_future = _SUMMARY_EXECUTOR.submit(fetch_content_count, tenant_id)
+        funnel_future = _SUMMARY_EXECUTOR.submit(
+            analyze_content_distribution, tenant_id, "Funnel Stage", include_examples=False
+        )
+        schema_future = _SUMMARY_EXECUTOR.submit(get_tenant_schema_info, tenant_id)
         
-        # Get schema info
-        schema_info = get_tenant_schema_info(tenant_id)
+        total_count = count_future.result()
+        funnel_dist = funnel_future.result()
+        schema_info = schema_future.result()
         
         return {
             "total_content": total_count,
@@ -319,7 +362,7 @@ def get_content_summary_stats(tenant_id: str) -> Dict[str, Any]:
         }
     except Exception as e:
         logger.error(f"Failed to generate summary stats: {e}")
-        return {"error": str(e), "operation": "content_summary"}
+        return {"status": "error", "error": str(e), "operation": "content_summary"}
 
 
 # Tool registry for easy access
@@ -332,57 +375,61 @@ AVAILABLE_TOOLS = [
     analyze_content_distribution,
     analyze_content_gaps,
     search_content_by_text,
+    search_content_multi,
     validate_category_values,
     get_content_summary_stats
 ]
 
 
+# Tool subsets per query type - built once at import, not on every task construction
+_TOOL_MAPPING = {
+    "SIMPLE_FILTER": (
+        fetch_basic_content,
+        filter_content_by_categories,
+        validate_category_values,
+        get_tenant_schema_info
+    ),
+    "COMPLEX_FILTER": (
+        filter_content_with_complex_criteria,
+        filter_content_by_categories,
+        validate_category_values,
+        get_tenant_schema_info
+    ),
+    "COUNT_ANALYTICS": (
+        count_content_by_criteria,
+        analyze_content_distribution,
+        get_content_summary_stats,
+        validate_category_values
+    ),
+    "DISTRIBUTION_ANALYTICS": (
+        analyze_content_distribution,
+        get_content_summary_stats,
+        filter_content_by_categories,
+        validate_category_values
+    ),
+    "STRATEGIC_ANALYSIS": (
+        analyze_content_gaps,
+        analyze_content_distribution,
+        get_content_summary_stats,
+        filter_content_by_categories
+    ),
+    "SEARCH": (
+        search_content_by_text,
+        search_content_multi,
+        filter_content_by_categories,
+        validate_category_values,
+        get_tenant_schema_info
+    ),
+    "GENERAL_CHAT": (
+        get_tenant_schema_info,
+        get_content_summary_stats,
+        fetch_basic_content,
+        validate_category_values
+    ),
+}
+
+
 def get_tools_for_query_type(query_type: str) -> List:
     """Return relevant tools based on query type for optimized agent performance"""
-    
-    tool_mapping = {
-        "SIMPLE_FILTER": [
-            fetch_basic_content,
-            filter_content_by_categories,
-            validate_category_values,
-            get_tenant_schema_info
-        ],
-        "COMPLEX_FILTER": [
-            filter_content_with_complex_criteria,
-            filter_content_by_categories,
-            validate_category_values,
-            get_tenant_schema_info
-        ],
-        "COUNT_ANALYTICS": [
-            count_content_by_criteria,
-            analyze_content_distribution,
-            get_content_summary_stats,
-            validate_category_values
-        ],
-        "DISTRIBUTION_ANALYTICS": [
-            analyze_content_distribution,
-            get_content_summary_stats,
-            filter_content_by_categories,
-            validate_category_values
-        ],
-        "STRATEGIC_ANALYSIS": [
-            analyze_content_gaps,
-            analyze_content_distribution,
-            get_content_summary_stats,
-            filter_content_by_categories
-        ],
-        "SEARCH": [
-            search_content_by_text,
-            filter_content_by_categories,
-            validate_category_values,
-            get_tenant_schema_info
-        ],
-        "GENERAL_CHAT": [
-            get_tenant_schema_info,
-            get_content_summary_stats,
-            fetch_basic_content,
-            validate_category_values
-        ]
-    }
-    
-    return tool_mapping.get(query_type, AVAILABLE_TOOLS)
\ No newline at end of file
+    tools = _TOOL_MAPPING.get(query_type)
+    return list(tools) if tools is not None else AVAILABLE_TOOLS
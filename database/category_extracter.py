@@ -1,15 +1,11 @@
 # scripts/extract_categories.py
 
-from collections import defaultdict
-from pymongo import MongoClient
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from bson import ObjectId
-import os
-from dotenv import load_dotenv
+from database.connection import get_database
 
-load_dotenv()
-
-MONGO_URI = "mongodb://localhost:27017"
-DB_NAME = "my_database"
 SITEMAPS_COLLECTION = "sitemaps"
 CATEGORY_COLLECTION = "categories"
 CATEGORY_ATTR_COLLECTION = "category_attributes"
@@ -19,8 +15,54 @@ TOPICS_COLLECTION = "topics"
 
 TENANT_ID = ObjectId("6875f3afc8337606d54a7f37")
 
-
-def extract_categorical_fields():
+CATEGORICAL_CACHE_TTL = 300  # seconds
+_categorical_cache = {}  # str(tenant_id) -> (expires_at, {field: values}, {category name: _id})
+_categorical_cache_lock = threading.Lock()
+
+# Lookup-only collections: output field name -> collection
+NAMED_VALUE_COLLECTIONS = {
+    "Content Type": CONTENT_TYPES_COLLECTION,
+    "Custom Tags": CUSTOM_TAGS_COLLECTION,
+    "Topics": TOPICS_COLLECTION,
+}
+
+
+def _load_category_values(db, tenant):
+    """({category name: sorted attribute names}, {category name: category _id}) for the tenant's sitemaps"""
+    category_rows = db[SITEMAPS_COLLECTION].aggregate([
+        {"$match": {"tenant": tenant}},
+        {"$project": {"_id": 0, "categoryAttribute": 1}},
+        {"$unwind": "$categoryAttribute"},
+        # Distinct attribute ids first, so each is looked up once rather than once per sitemap
+        {"$group": {"_id": "$categoryAttribute"}},
+        {"$lookup": {"from": CATEGORY_ATTR_COLLECTION, "localField": "_id", "foreignField": "_id", "as": "attr"}},
+        {"$unwind": "$attr"},
+        {"$match": {"attr.tenant": tenant}},
+        {"$lookup": {"from": CATEGORY_COLLECTION, "localField": "attr.category", "foreignField": "_id", "as": "cat"}},
+        {"$unwind": "$cat"},
+        {"$match": {"cat.tenant": tenant}},
+        {"$group": {"_id": "$cat.name", "category_id": {"$first": "$cat._id"}, "values": {"$addToSet": "$attr.name"}}},
+    ], allowDiskUse=True, batchSize=1000)
+    category_values, category_ids = {}, {}
+    for row in category_rows:
+        category_values[row["_id"]] = sorted(row["values"])
+        category_ids[row["_id"]] = row["category_id"]
+    return category_values, category_ids
+
+
+def _load_languages(db, tenant):
+    """geoFocus values, reported as Language"""
+    languages = db[SITEMAPS_COLLECTION].distinct("geoFocus", {"tenant": tenant, "geoFocus": {"$nin": [None, ""]}})
+    return {"Language": sorted(languages)} if languages else {}
+
+
+def _load_names(db, tenant, field_name, collection_name):
+    """Distinct names from a lookup-only collection (content types, tags, topics)"""
+    names = db[collection_name].distinct("name", {"tenant": tenant})
+    return {field_name: sorted(names)} if names else {}
+
+
+def extract_categorical_fields(tenant_id=TENANT_ID):
     """
     Extract all categorical fields for a tenant:
     - categoryAttribute mappings (categories + attributes)
@@ -28,62 +70,64 @@ def extract_categorical_fields():
     - content_types
     - custom_tags
     - topics
+
+    Results are memoized per tenant for CATEGORICAL_CACHE_TTL seconds (category values
+    change on the order of hours); call invalidate_categorical_cache() after tenant
+    category writes.
+    """
+    return extract_categorical_fields_and_ids(tenant_id)[0]
+
+
+def extract_categorical_fields_and_ids(tenant_id=TENANT_ID):
+    """
+    extract_categorical_fields() plus {category name: category _id} for the categoryAttribute
+    categories, read by the same aggregation - saves the schema extractor a categories query
+    """
+    key = str(tenant_id)
+    now = time.monotonic()
+    cached = _categorical_cache.get(key)
+    if cached is None or cached[0] <= now:
+        categorical_fields, category_ids = _query_categorical_fields(ObjectId(key))
+        with _categorical_cache_lock:
+            _categorical_cache[key] = (now + CATEGORICAL_CACHE_TTL, categorical_fields, category_ids)
+    else:
+        _, categorical_fields, category_ids = cached
+
+    # Callers get their own lists - the cached dicts are shared
+    return {field: list(values) for field, values in categorical_fields.items()}, dict(category_ids)
+
+
+def invalidate_categorical_cache(tenant_id=None):
+    """Drop the memoized categorical fields for one tenant (or all tenants)"""
+    with _categorical_cache_lock:
+        if tenant_id is None:
+            _categorical_cache.clear()
+        else:
+            _categorical_cache.pop(str(tenant_id), None)
+
+
+def _query_categorical_fields(tenant):
+    """
+    The category join and the de-duplication run server-side, so only the final
+    {category: values} rows cross the wire instead of every sitemap document. The five
+    queries are independent and run concurrently. Returns (categorical fields, category ids).
     """
-    client = MongoClient(MONGO_URI)
-    db = client[DB_NAME]
-
-    value_sets = defaultdict(set)
-
-    # ----------------------------
-    # Categories + Attributes
-    # ----------------------------
-    categories = {str(cat["_id"]): cat["name"] for cat in db[CATEGORY_COLLECTION].find({"tenant": TENANT_ID})}
-
-    category_attrs = {}
-    for attr in db[CATEGORY_ATTR_COLLECTION].find({"tenant": TENANT_ID}):
-        category_id = str(attr["category"])
-        category_name = categories.get(category_id)
-        if category_name:
-            category_attrs[str(attr["_id"])] = {
-                "category_name": category_name,
-                "attribute_name": attr["name"]
-            }
-
-    for doc in db[SITEMAPS_COLLECTION].find({"tenant": TENANT_ID}):
-        attr_ids = doc.get("categoryAttribute", [])
-        for attr_id in attr_ids:
-            attr_info = category_attrs.get(str(attr_id))
-            if attr_info:
-                value_sets[attr_info["category_name"]].add(attr_info["attribute_name"])
-
-        geo_focus = doc.get("geoFocus")
-        if geo_focus:
-            value_sets["Language"].add(geo_focus)
-
-    # ----------------------------
-    # Content Types
-    # ----------------------------
-    for ct in db[CONTENT_TYPES_COLLECTION].find({"tenant": TENANT_ID}):
-        value_sets["Content Type"].add(ct["name"])
-
-    # ----------------------------
-    # Custom Tags
-    # ----------------------------
-    for tag in db[CUSTOM_TAGS_COLLECTION].find({"tenant": TENANT_ID}):
-        value_sets["Custom Tags"].add(tag["name"])
-
-    # ----------------------------
-    # Topics
-    # ----------------------------
-    for topic in db[TOPICS_COLLECTION].find({"tenant": TENANT_ID}):
-        value_sets["Topics"].add(topic["name"])
-
-    client.close()
-
-    # Convert sets to lists
-    categorical_fields = {k: sorted(list(v)) for k, v in value_sets.items()}
-
-    return categorical_fields
+    db = get_database()  # shared pooled client - safe to use from the worker threads
+
+    with ThreadPoolExecutor(max_workers=2 + len(NAMED_VALUE_COLLECTIONS)) as executor:
+        futures = [
+            executor.submit(_load_category_values, db, tenant),
+            executor.submit(_load_languages, db, tenant),
+        ] + [
+            executor.submit(_load_names, db, tenant, field_name, collection_name)
+            for field_name, collection_name in NAMED_VALUE_COLLECTIONS.items()
+        ]
+        # Merge in submission order so the output order stays stable
+        categorical_fields, category_ids = futures[0].result()
+        for future in futures[1:]:
+            categorical_fields.update(future.result())
+
+    return categorical_fields, category_ids
 
 
 if __name__ == "__main__":
@@ -21,6 +21,8 @@ plus helper functions to get a database instance,
 test connectivity, and close the connection cleanly.
 """
 
+import atexit
+
 from pymongo import MongoClient
 from config.settings import get_database_config
 from utils.logger import get_logger, log_error
@@ -40,7 +42,13 @@ def get_mongodb_client() -> MongoClient:
         logger = get_logger("database")
 
         try:
-            _mongo_client = MongoClient(db_config["connection_string"])
+            # One pooled client for the whole process - every module borrows connections from it
+            _mongo_client = MongoClient(
+                db_config["connection_string"],
+                maxPoolSize=db_config["max_pool_size"],
+                minPoolSize=db_config["min_pool_size"],
+                serverSelectionTimeoutMS=db_config["server_selection_timeout_ms"],
+            )
             logger.info(
                 "MongoDB client created",
                 connection=db_config["connection_string"],
@@ -95,3 +103,7 @@ def close_connection():
             log_error(e, {"operation": "mongo_close"})
         finally:
             _mongo_client = None
+
+
+# Keep the pool for the life of the process; shut it down once at interpreter exit
+atexit.register(close_connection)
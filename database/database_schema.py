@@ -1,14 +1,20 @@
-from pymongo import MongoClient
 from bson import ObjectId
 from typing import Dict, List, Optional, Any
 import logging
 from dataclasses import dataclass
-from database.category_extracter import extract_categorical_fields
+from functools import cached_property
+import threading
+import time
+from database.connection import get_database
+from database.category_extracter import extract_categorical_fields, extract_categorical_fields_and_ids, invalidate_categorical_cache
 
-MONGO_URI = "mongodb://localhost:27017"
-DB_NAME = "my_database"
 TENANT_ID = ObjectId("6875f3afc8337606d54a7f37")
 
+SCHEMA_CACHE_TTL = 300  # seconds
+# str(tenant_id) -> (expires_at, (TenantSchema, field mapping dict))
+_schema_cache: Dict[str, tuple] = {}
+_schema_cache_lock = threading.Lock()
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -29,6 +35,53 @@ class TenantSchema:
     tenant_id: str
     categories: Dict[str, List[str]]  # from category_extractor
     field_mappings: Dict[str, FieldMapping]  # discovered mappings
+    
+    @cached_property
+    def database_field_mapping(self) -> Dict[str, Dict[str, Any]]:
+        """field_mappings in the original (query parser) format, built once per schema"""
+        direct = {
+            name: {"collection": m.source_collection, "field_path": m.field_path,
+                   "lookup_field": None, "requires_join": False}
+            for name, m in self.field_mappings.items() if not m.requires_join
+        }
+        joined = {
+            name: {"collection": m.reference_collection, "field_path": m.field_path,
+                   "lookup_field": "name", "requires_join": True}
+            for name, m in self.field_mappings.items() if m.requires_join
+        }
+        # Keep the discovery order of field_mappings
+        return {name: direct.get(name) or joined[name] for name in self.field_mappings}
+
+# Direct field mappings (no joins required)
+_DIRECT_MAPPINGS: Dict[str, FieldMapping] = {
+    "Language": FieldMapping(
+        category_name="Language",
+        source_collection="sitemaps",
+        field_path="geoFocus",
+        requires_join=False
+    )
+}
+
+# Reference collection mappings (require joins): category -> (collection, sitemap field)
+_REFERENCE_MAPPINGS: Dict[str, FieldMapping] = {
+    category_name: FieldMapping(
+        category_name=category_name,
+        source_collection="sitemaps",
+        field_path=field_path,
+        requires_join=True,
+        reference_collection=ref_collection,
+        join_config={
+            "from": ref_collection,
+            "local_field": field_path,
+            "foreign_field": "_id"
+        }
+    )
+    for category_name, (ref_collection, field_path) in {
+        "Content Type": ("content_types", "contentType"),
+        "Custom Tags": ("custom_tags", "tag"),
+        "Topics": ("topics", "topic")
+    }.items()
+}
 
 class SimplifiedSchemaExtractor:
     """
@@ -36,9 +89,9 @@ class SimplifiedSchemaExtractor:
     and only focuses on discovering field mappings
     """
     
-    def __init__(self, mongo_uri: str = MONGO_URI, db_name: str = DB_NAME):
-        self.client = MongoClient(mongo_uri)
-        self.db = self.client[db_name]
+    def __init__(self, db=None):
+        # Defaults to the process-wide pooled client's database
+        self.db = db if db is not None else get_database()
     
     def extract_tenant_schema(self, tenant_id: str = str(TENANT_ID)) -> TenantSchema:
         """
@@ -48,11 +101,11 @@ class SimplifiedSchemaExtractor:
             tenant_object_id = ObjectId(tenant_id)
             logger.info(f"Extracting schema for tenant: {tenant_id}")
             
-            # Step 1: Use existing category extractor
-            categories = extract_categorical_fields()
+            # Step 1: Use existing category extractor (category ids come from the same query)
+            categories, category_name_to_id = extract_categorical_fields_and_ids(tenant_id)
             
             # Step 2: Discover field mappings for these categories
-            field_mappings = self._discover_field_mappings(tenant_object_id, categories)
+            field_mappings = self._discover_field_mappings(tenant_object_id, categories, category_name_to_id)
             
             schema = TenantSchema(
                 tenant_id=tenant_id,
@@ -67,14 +120,16 @@ class SimplifiedSchemaExtractor:
             logger.error(f"Error extracting schema for tenant {tenant_id}: {str(e)}")
             raise
     
-    def _discover_field_mappings(self, tenant_id: ObjectId, categories: Dict[str, List[str]]) -> Dict[str, FieldMapping]:
+    def _discover_field_mappings(self, tenant_id: ObjectId, categories: Dict[str, List[str]],
+                                 category_name_to_id: Optional[Dict[str, ObjectId]] = None) -> Dict[str, FieldMapping]:
         """
         Discover field mappings based on known patterns and category types
         """
         field_mappings = {}
         
-        # Get category ID mappings for join configs
-        category_name_to_id = self._get_category_name_to_id_mapping(tenant_id)
+        # Get category ID mappings for join configs unless the caller already has them
+        if category_name_to_id is None:
+            category_name_to_id = self._get_category_name_to_id_mapping(tenant_id)
         
         for category_name in categories.keys():
             mapping = self._create_field_mapping(category_name, category_name_to_id.get(category_name))
@@ -86,7 +141,7 @@ class SimplifiedSchemaExtractor:
     def _get_category_name_to_id_mapping(self, tenant_id: ObjectId) -> Dict[str, ObjectId]:
         """Get mapping from category names to their ObjectIds"""
         try:
-            categories = self.db.categories.find({"tenant": tenant_id})
+            categories = self.db.categories.find({"tenant": tenant_id}, {"name": 1}).batch_size(1000)
             return {cat["name"]: cat["_id"] for cat in categories}
         except Exception as e:
             logger.error(f"Error getting category mappings: {str(e)}")
@@ -96,40 +151,12 @@ class SimplifiedSchemaExtractor:
         """
         Create field mapping based on category name and known patterns
         """
-        # Direct field mappings (no joins required)
-        direct_mappings = {
-            "Language": FieldMapping(
-                category_name="Language",
-                source_collection="sitemaps",
-                field_path="geoFocus",
-                requires_join=False
-            )
-        }
+        # Direct and reference collection mappings are fixed; reuse the prebuilt instances
+        if category_name in _DIRECT_MAPPINGS:
+            return _DIRECT_MAPPINGS[category_name]
         
-        if category_name in direct_mappings:
-            return direct_mappings[category_name]
-        
-        # Reference collection mappings (require joins)
-        reference_mappings = {
-            "Content Type": ("content_types", "contentType"),
-            "Custom Tags": ("custom_tags", "tag"),
-            "Topics": ("topics", "topic")
-        }
-        
-        if category_name in reference_mappings:
-            ref_collection, field_path = reference_mappings[category_name]
-            return FieldMapping(
-                category_name=category_name,
-                source_collection="sitemaps",
-                field_path=field_path,
-                requires_join=True,
-                reference_collection=ref_collection,
-                join_config={
-                    "from": ref_collection,
-                    "local_field": field_path,
-                    "foreign_field": "_id"
-                }
-            )
+        if category_name in _REFERENCE_MAPPINGS:
+            return _REFERENCE_MAPPINGS[category_name]
         
         # Category attribute mappings (most complex joins)
         if category_id:
@@ -151,66 +178,85 @@ class SimplifiedSchemaExtractor:
         logger.warning(f"Could not create mapping for category: {category_name}")
         return None
     
-    def get_database_field_mapping(self, tenant_id: str = str(TENANT_ID)) -> Dict[str, Dict[str, Any]]:
+    def get_database_field_mapping(self, tenant_id: str = str(TENANT_ID),
+                                   schema: Optional[TenantSchema] = None) -> Dict[str, Dict[str, Any]]:
         """
         Get field mapping in the format expected by your query parser
+        (pass an already extracted schema to skip re-extraction)
         """
         try:
-            schema = self.extract_tenant_schema(tenant_id)
-            
-            # Convert to original format for backwards compatibility
-            field_mapping = {}
-            for category_name, mapping in schema.field_mappings.items():
-                field_mapping[category_name] = {
-                    "collection": mapping.reference_collection if mapping.requires_join else mapping.source_collection,
-                    "field_path": mapping.field_path,
-                    "lookup_field": "name" if mapping.requires_join else None,
-                    "requires_join": mapping.requires_join
-                }
-            
-            return field_mapping
+            if schema is None:
+                schema = self.extract_tenant_schema(tenant_id)
+            return self.to_database_field_mapping(schema)
             
         except Exception as e:
             logger.error(f"Error getting field mapping: {str(e)}")
             return {}
     
+    @staticmethod
+    def to_database_field_mapping(schema: TenantSchema) -> Dict[str, Dict[str, Any]]:
+        """Convert a schema's field mappings to the original (query parser) format"""
+        return schema.database_field_mapping
+    
     def close(self):
-        """Close database connection"""
-        self.client.close()
+        """No-op kept for existing callers - the shared pooled client stays open"""
 
 
 # Example usage and integration functions
+def _get_cached_schema_and_mappings(tenant_id: str) -> tuple[TenantSchema, Dict[str, Dict[str, Any]]]:
+    """
+    (schema, field mappings) for a tenant, memoized together for SCHEMA_CACHE_TTL seconds so
+    the convenience functions below cost one dict lookup per chat turn
+    """
+    key = str(tenant_id)
+    now = time.monotonic()
+    cached = _schema_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    schema = SimplifiedSchemaExtractor().extract_tenant_schema(key)
+    entry = (schema, SimplifiedSchemaExtractor.to_database_field_mapping(schema))
+    
+    with _schema_cache_lock:
+        _schema_cache[key] = (now + SCHEMA_CACHE_TTL, entry)
+    return entry
+
+
+def invalidate_tenant_schema_cache(tenant_id: Optional[str] = None):
+    """Drop memoized schemas and categorical fields for one tenant (or all) - call after category writes"""
+    with _schema_cache_lock:
+        if tenant_id is None:
+            _schema_cache.clear()
+        else:
+            _schema_cache.pop(str(tenant_id), None)
+    invalidate_categorical_cache(tenant_id)
+
+
 def get_tenant_categories_and_mappings(tenant_id: str = str(TENANT_ID)) -> tuple[Dict[str, List[str]], Dict[str, Dict[str, Any]]]:
     """
     Convenience function to get both categories and field mappings
     Returns: (categories_dict, field_mappings_dict)
     """
-    extractor = SimplifiedSchemaExtractor()
-    try:
-        schema = extractor.extract_tenant_schema(tenant_id)
-        field_mappings = extractor.get_database_field_mapping(tenant_id)
-        return schema.categories, field_mappings
-    finally:
-        extractor.close()
+    schema, field_mappings = _get_cached_schema_and_mappings(tenant_id)
+    return schema.categories, field_mappings
 
 
 def get_dynamic_tenant_categories(tenant_id: str = str(TENANT_ID)) -> Dict[str, List[str]]:
     """
     Drop-in replacement for extract_categorical_fields() with tenant support
     """
-    # For now, just use the existing function, but this can be extended
-    return extract_categorical_fields()
+    return extract_categorical_fields(tenant_id)
 
 
 def get_dynamic_field_mappings(tenant_id: str = str(TENANT_ID)) -> Dict[str, Dict[str, Any]]:
     """
     Dynamic field mappings to replace hardcoded get_database_field_mapping()
     """
-    extractor = SimplifiedSchemaExtractor()
     try:
-        return extractor.get_database_field_mapping(tenant_id)
-    finally:
-        extractor.close()
+        return _get_cached_schema_and_mappings(tenant_id)[1]
+    except Exception as e:
+        logger.error(f"Error getting field mapping: {str(e)}")
+        return {}
 
 
 # Example usage
@@ -1,4 +1,5 @@
 import logging
+from dataclasses import replace
 from typing import Dict
 from bson import ObjectId
 
@@ -9,12 +10,110 @@ from database.category_extracter import extract_categorical_fields
 logger = logging.getLogger(__name__)
 
 
+# Category ids of the demo tenant, parsed once
+_CAT_PAGE_TYPE = ObjectId("6875f3afa677f67a172c63a6")
+_CAT_FUNNEL_STAGE = ObjectId("6875f3afa677f67a172c63a7")
+_CAT_PRIMARY_AUDIENCE = ObjectId("6875f3afa677f67a172c63a8")
+_CAT_SECONDARY_AUDIENCE = ObjectId("6875f3afa677f67a172c63a9")
+_CAT_INDUSTRY = ObjectId("6875f3afa677f67a172c63aa")
+
+
+def _category_attribute_mapping(category_name: str, category_id: ObjectId) -> FieldMapping:
+    """Mapping for a category stored in the sitemaps' categoryAttribute array"""
+    return FieldMapping(
+        category_name=category_name,
+        source_collection="sitemaps",
+        field_path="categoryAttribute",
+        requires_join=True,
+        reference_collection="category_attributes",
+        join_config={
+            "from": "category_attributes",
+            "local_field": "categoryAttribute",
+            "foreign_field": "_id",
+            "filter_field": "category",
+            "filter_value": category_id,
+        },
+        is_array=True,   # ✅ categoryAttribute is an array
+    )
+
+
+# The static demo schema is input-independent, so it is built once at import.
+# Every extracted TenantSchema shares these dicts - treat them as read-only.
+_STATIC_CATEGORIES: Dict[str, list] = {
+    "Page Type": ["Product Page", "Legal Page", "Promotional Page", "Resource Hub", "Careers Page", "Podcast Page", "Webinar"],
+    "Funnel Stage": ["MOFU", "TOFU", "BOFU"],
+    "Primary Audience": ["Individual Investors", "Live Nation Employees", "Job Seekers", "Collectors", "General Audience", "Women of Color", "Businesses"],
+    "Industry": ["Financial Services", "Fashion", "General", "Alternative Investments", "Semiconductors", "Digital Infrastructure", "Biotech", "Telecommunications"],
+    "Secondary Audience": ["Financial Advisors", "Businesses", "Collectors", "Individual Investors", "General Audience", "Freelancers", "Job Seekers", "College Students", "Women of Color"],
+}
+
+_STATIC_FIELD_MAPPINGS: Dict[str, FieldMapping] = {
+    "Page Type": _category_attribute_mapping("Page Type", _CAT_PAGE_TYPE),
+    "Funnel Stage": _category_attribute_mapping("Funnel Stage", _CAT_FUNNEL_STAGE),
+    "Primary Audience": _category_attribute_mapping("Primary Audience", _CAT_PRIMARY_AUDIENCE),
+    "Industry": _category_attribute_mapping("Industry", _CAT_INDUSTRY),
+    "Secondary Audience": _category_attribute_mapping("Secondary Audience", _CAT_SECONDARY_AUDIENCE),
+    "Topic": FieldMapping(
+        category_name="Topic",
+        source_collection="sitemaps",
+        field_path="topic",
+        requires_join=True,
+        reference_collection="topics",
+        join_config={
+            "from": "topics",
+            "local_field": "topic",
+            "foreign_field": "_id",
+        },
+        is_array=False,  # 👈 assuming topic is single ref (change to True if array)
+    ),
+    "Content Type": FieldMapping(
+        category_name="Content Type",
+        source_collection="sitemaps",
+        field_path="contentType",
+        requires_join=True,
+        reference_collection="content_types",
+        join_config={
+            "from": "content_types",
+            "local_field": "contentType",
+            "foreign_field": "_id",
+        },
+        is_array=False,
+    ),
+    "Language": FieldMapping(
+        category_name="Language",
+        source_collection="sitemaps",
+        field_path="geoFocus",
+        requires_join=False,
+        reference_collection=None,
+        join_config=None,
+        is_array=False,  # 👈 scalar field
+    ),
+}
+
+_STATIC_COLLECTIONS_INFO: Dict[str, CollectionInfo] = {
+    "categories": CollectionInfo(name="categories", id_field="_id", name_field="name", tenant_field="tenant"),
+    "category_attributes": CollectionInfo(name="category_attributes", id_field="_id", name_field="name", tenant_field="tenant"),
+    "content_types": CollectionInfo(name="content_types", id_field="_id", name_field="name", tenant_field="tenant"),
+    "topics": CollectionInfo(name="topics", id_field="_id", name_field="name", tenant_field="tenant"),
+    "custom_tags": CollectionInfo(name="custom_tags", id_field="_id", name_field="name", tenant_field="tenant"),
+    "sitemaps": CollectionInfo(name="sitemaps", id_field="_id", name_field="name", tenant_field="tenant"),
+}
+
+_STATIC_SCHEMA = TenantSchema(
+    tenant_id="",
+    categories=_STATIC_CATEGORIES,
+    field_mappings=_STATIC_FIELD_MAPPINGS,
+    collections_info=_STATIC_COLLECTIONS_INFO,
+)
+
+
 class DynamicTenantSchemaExtractor:
     """Extracts and builds tenant schema (demo: static schema)."""
 
-    def __init__(self, tenant_id: str):
+    def __init__(self, tenant_id: str, db=None):
         self.tenant_id = tenant_id
-        self.db = get_database()
+        # Defaults to the process-wide pooled client's database
+        self.db = db if db is not None else get_database()
 
     def extract_schema(self) -> TenantSchema:
         """
@@ -22,142 +121,7 @@ class DynamicTenantSchemaExtractor:
         Later: query categories + category_attributes dynamically.
         """
         logger.info("Extracting schema for tenant_id=%s", self.tenant_id)
-
-        categories = {
-            "Page Type": ["Product Page", "Legal Page", "Promotional Page", "Resource Hub", "Careers Page", "Podcast Page", "Webinar"],
-            "Funnel Stage": ["MOFU", "TOFU", "BOFU"],
-            "Primary Audience": ["Individual Investors", "Live Nation Employees", "Job Seekers", "Collectors", "General Audience", "Women of Color", "Businesses"],
-            "Industry": ["Financial Services", "Fashion", "General", "Alternative Investments", "Semiconductors", "Digital Infrastructure", "Biotech", "Telecommunications"],
-            "Secondary Audience": ["Financial Advisors", "Businesses", "Collectors", "Individual Investors", "General Audience", "Freelancers", "Job Seekers", "College Students", "Women of Color"],
-        }
-        field_mappings: Dict[str, FieldMapping] = {
-            "Page Type": FieldMapping(
-                category_name="Page Type",
-                source_collection="sitemaps",
-                field_path="categoryAttribute",
-                requires_join=True,
-                reference_collection="category_attributes",
-                join_config={
-                    "from": "category_attributes",
-                    "local_field": "categoryAttribute",
-                    "foreign_field": "_id",
-                    "filter_field": "category",
-                    "filter_value": ObjectId("6875f3afa677f67a172c63a6"),
-                },
-                is_array=True,   # ✅ categoryAttribute is an array
-            ),
-            "Funnel Stage": FieldMapping(
-                category_name="Funnel Stage",
-                source_collection="sitemaps",
-                field_path="categoryAttribute",
-                requires_join=True,
-                reference_collection="category_attributes",
-                join_config={
-                    "from": "category_attributes",
-                    "local_field": "categoryAttribute",
-                    "foreign_field": "_id",
-                    "filter_field": "category",
-                    "filter_value": ObjectId("6875f3afa677f67a172c63a7"),
-                },
-                is_array=True,   # ✅ also from categoryAttribute
-            ),
-            "Primary Audience": FieldMapping(
-                category_name="Primary Audience",
-                source_collection="sitemaps",
-                field_path="categoryAttribute",
-                requires_join=True,
-                reference_collection="category_attributes",
-                join_config={
-                    "from": "category_attributes",
-                    "local_field": "categoryAttribute",
-                    "foreign_field": "_id",
-                    "filter_field": "category",
-                    "filter_value": ObjectId("6875f3afa677f67a172c63a8"),
-                },
-                is_array=True,
-            ),
-            "Industry": FieldMapping(
-                category_name="Industry",
-                source_collection="sitemaps",
-                field_path="categoryAttribute",
-                requires_join=True,
-                reference_collection="category_attributes",
-                join_config={
-                    "from": "category_attributes",
-                    "local_field": "categoryAttribute",
-                    "foreign_field": "_id",
-                    "filter_field": "category",
-                    "filter_value": ObjectId("6875f3afa677f67a172c63aa"),
-                },
-                is_array=True,
-            ),
-            "Secondary Audience": FieldMapping(
-                category_name="Secondary Audience",
-                source_collection="sitemaps",
-                field_path="categoryAttribute",
-                requires_join=True,
-                reference_collection="category_attributes",
-                join_config={
-                    "from": "category_attributes",
-                    "local_field": "categoryAttribute",
-                    "foreign_field": "_id",
-                    "filter_field": "category",
-                    "filter_value": ObjectId("6875f3afa677f67a172c63a9"),
-                },
-                is_array=True,
-            ),
-            "Topic": FieldMapping(
-                category_name="Topic",
-                source_collection="sitemaps",
-                field_path="topic",
-                requires_join=True,
-                reference_collection="topics",
-                join_config={
-                    "from": "topics",
-                    "local_field": "topic",
-                    "foreign_field": "_id",
-                },
-                is_array=False,  # 👈 assuming topic is single ref (change to True if array)
-            ),
-            "Content Type": FieldMapping(
-                category_name="Content Type",
-                source_collection="sitemaps",
-                field_path="contentType",
-                requires_join=True,
-                reference_collection="content_types",
-                join_config={
-                    "from": "content_types",
-                    "local_field": "contentType",
-                    "foreign_field": "_id",
-                },
-                is_array=False,
-            ),
-            "Language": FieldMapping(
-                category_name="Language",
-                source_collection="sitemaps",
-                field_path="geoFocus",
-                requires_join=False,
-                reference_collection=None,
-                join_config=None,
-                is_array=False,  # 👈 scalar field
-            ),
-        }
-
-        collections_info = {
-            "categories": CollectionInfo(name="categories", id_field="_id", name_field="name", tenant_field="tenant"),
-            "category_attributes": CollectionInfo(name="category_attributes", id_field="_id", name_field="name", tenant_field="tenant"),
-            "content_types": CollectionInfo(name="content_types", id_field="_id", name_field="name", tenant_field="tenant"),
-            "topics": CollectionInfo(name="topics", id_field="_id", name_field="name", tenant_field="tenant"),
-            "custom_tags": CollectionInfo(name="custom_tags", id_field="_id", name_field="name", tenant_field="tenant"),
-            "sitemaps": CollectionInfo(name="sitemaps", id_field="_id", name_field="name", tenant_field="tenant"),
-        }
-
-        return TenantSchema(
-            tenant_id=self.tenant_id,
-            categories=categories,
-            field_mappings=field_mappings,
-            collections_info=collections_info,
-        )
+        return replace(_STATIC_SCHEMA, tenant_id=self.tenant_id)
 
 if __name__ == "__main__":
     extractor = DynamicTenantSchemaExtractor
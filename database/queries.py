@@ -24,8 +24,7 @@ def fetch_content(tenant_id: str, limit: int = 30, skip: int = 0) -> List[Dict]:
         extractor = DynamicTenantSchemaExtractor(tenant_id)
         tenant_schema = extractor.extract_schema()
 
-        cursor = db.sitemaps.find({"tenant": ObjectId(tenant_id)}).skip(skip).limit(limit)
-        return [_clean_content_doc_enhanced(db, doc, tenant_schema) for doc in cursor]
+        return _fetch_sitemaps_resolved(db, tenant_schema, {"tenant": ObjectId(tenant_id)}, skip, limit)
     except Exception as e:
         log_error(e, {"operation": "fetch_content", "tenant_id": tenant_id})
         return []
@@ -43,8 +42,7 @@ def fetch_content_by_filters(tenant_id: str, filters: Dict[str, Union[str, List[
         resolved_filters = _resolve_complex_filters_to_query(db, tenant_schema, filters)
         mongo_filters.update(resolved_filters)
 
-        cursor = db.sitemaps.find(mongo_filters).skip(skip).limit(limit)
-        return [_clean_content_doc_enhanced(db, doc, tenant_schema) for doc in cursor]
+        return _fetch_sitemaps_resolved(db, tenant_schema, mongo_filters, skip, limit)
     except Exception as e:
         log_error(e, {"operation": "fetch_content_by_filters", "tenant_id": tenant_id, "filters": filters})
         return []
@@ -109,8 +107,7 @@ def fetch_content_with_complex_filters(tenant_id: str, category_filters: Dict[st
                     mongo_filters[field] = value
 
         # Execute query
-        cursor = db.sitemaps.find(mongo_filters).skip(skip).limit(limit)
-        results = [_clean_content_doc_enhanced(db, doc, tenant_schema) for doc in cursor]
+        results = _fetch_sitemaps_resolved(db, tenant_schema, mongo_filters, skip, limit)
         
         # Get total count
         total_count = db.sitemaps.count_documents(mongo_filters)
@@ -251,6 +248,25 @@ def create_search_indexes(db):
         logger.warning(f"Failed to create search indexes: {e}")
 
 
+def create_tenant_indexes(db):
+    """
+    Create the tenant-scoped indexes behind the schema extraction and filter queries
+    (every read is scoped by tenant; categoryAttribute and geoFocus are the filtered fields)
+    Call this during application initialization - create_index is a no-op if the index exists
+    """
+    try:
+        db.sitemaps.create_index([("tenant", 1), ("categoryAttribute", 1)])
+        db.sitemaps.create_index([("tenant", 1), ("geoFocus", 1)])
+        db.category_attributes.create_index([("tenant", 1), ("category", 1)])
+        for collection_name in ("categories", "content_types", "custom_tags", "topics"):
+            db[collection_name].create_index([("tenant", 1)])
+        
+        logger.info("Created tenant indexes")
+        
+    except Exception as e:
+        logger.warning(f"Failed to create tenant indexes: {e}")
+
+
 def search_content_by_text(tenant_id: str, search_query: str, 
                           search_fields: List[str] = ["description", "summary", "readerBenefit", "name"],
                           include_category_search: bool = True,
@@ -390,6 +406,73 @@ def search_content_by_text(tenant_id: str, search_query: str,
         return {"results": [], "total_found": 0, "error": str(e)}
 
 
+def fetch_content_multi_search(tenant_id: str, search_queries: List[str],
+                               search_fields: List[str] = ["description", "summary", "readerBenefit", "name"],
+                               limit_per_query: int = 10) -> Dict[str, Any]:
+    """
+    Run several text searches in one round-trip: a single aggregation with one $facet branch per
+    query (case-insensitive match across the content fields, like the regex search fallback)
+    """
+    db = get_database()
+    try:
+        queries = list(dict.fromkeys(q.strip() for q in search_queries if q and q.strip()))
+        if not queries:
+            return {"results_by_query": {}, "total_found": 0, "search_queries": []}
+        
+        extractor = DynamicTenantSchemaExtractor(tenant_id)
+        tenant_schema = extractor.extract_schema()
+        
+        conditions = [
+            {"$or": [{field: {"$regex": re.escape(query), "$options": "i"}} for field in search_fields]}
+            for query in queries
+        ]
+        pipeline = [
+            # Narrow to documents matching any query once, then split per query server-side
+            {"$match": {"tenant": ObjectId(tenant_id), "$or": conditions}},
+            {"$facet": {
+                f"q{i}": [{"$match": condition}, {"$limit": limit_per_query}]
+                for i, condition in enumerate(conditions)
+            }}
+        ]
+        faceted = next(db.sitemaps.aggregate(pipeline), {})
+        
+        cleaned_by_id = {}
+        results_by_query = {}
+        for i, query in enumerate(queries):
+            search_terms = query.lower().split()
+            query_results = []
+            for doc in faceted.get(f"q{i}", []):
+                if doc["_id"] not in cleaned_by_id:
+                    cleaned_by_id[doc["_id"]] = _clean_content_doc_enhanced(db, doc, tenant_schema)
+                cleaned_doc = dict(cleaned_by_id[doc["_id"]])
+                
+                # Relevance score based on term frequency (same as the regex search)
+                relevance_score = 0
+                for field in search_fields:
+                    if field in doc and doc[field]:
+                        field_text = doc[field].lower()
+                        for term in search_terms:
+                            relevance_score += field_text.count(term)
+                
+                cleaned_doc["relevance_score"] = relevance_score
+                cleaned_doc["match_reason"] = "content_text_regex"
+                query_results.append(cleaned_doc)
+            
+            query_results.sort(key=lambda x: x["relevance_score"], reverse=True)
+            results_by_query[query] = query_results
+        
+        return {
+            "results_by_query": results_by_query,
+            "total_found": len(cleaned_by_id),
+            "search_queries": queries,
+            "search_fields": search_fields
+        }
+        
+    except Exception as e:
+        log_error(e, {"operation": "fetch_content_multi_search", "tenant_id": tenant_id})
+        return {"results_by_query": {}, "total_found": 0, "error": str(e)}
+
+
 def fetch_content_gap_analysis(tenant_id: str, primary_dimension: str, secondary_dimension: str = None) -> Dict[str, Any]:
     """
     Identify content gaps and recommendations for strategic analysis
@@ -438,8 +521,61 @@ def fetch_content_gap_analysis(tenant_id: str, primary_dimension: str, secondary
 # HELPER FUNCTIONS
 # ================================
 
+# Prefix for the arrays the $lookup stages below join onto each sitemap document
+_JOINED_PREFIX = "_joined_"
+
+
+def _reference_lookup_stages(tenant_schema) -> List[Dict]:
+    """
+    $lookup stages resolving every reference field of the schema in the same round trip.
+    categoryAttribute is joined once for all categories (with the category id kept) and
+    split per category while cleaning.
+    """
+    if not tenant_schema:
+        return []
+
+    stages = []
+    joined_fields = []
+    for mapping in tenant_schema.field_mappings.values():
+        if not (mapping.requires_join and mapping.reference_collection) or mapping.field_path in joined_fields:
+            continue
+        joined_fields.append(mapping.field_path)
+        stages.append({"$lookup": {
+            "from": mapping.reference_collection,
+            "localField": mapping.field_path,
+            "foreignField": "_id",
+            "as": _JOINED_PREFIX + mapping.field_path
+        }})
+    # Only the fields cleaning reads cross the wire
+    if joined_fields:
+        stages.append({"$addFields": {
+            _JOINED_PREFIX + field_path: {"$map": {
+                "input": "$" + _JOINED_PREFIX + field_path,
+                "as": "ref",
+                "in": {"_id": "$$ref._id", "name": "$$ref.name", "category": "$$ref.category"}
+            }}
+            for field_path in joined_fields
+        }})
+    return stages
+
+
+def _fetch_sitemaps_resolved(db, tenant_schema, mongo_filters: Dict, skip: int, limit: int) -> List[Dict]:
+    """Page of sitemaps with all reference fields resolved by one aggregation (no per-document lookups)"""
+    pipeline = [{"$match": mongo_filters}]
+    if skip:
+        pipeline.append({"$skip": skip})
+    pipeline.append({"$limit": limit})
+    pipeline.extend(_reference_lookup_stages(tenant_schema))
+
+    cursor = db.sitemaps.aggregate(pipeline, allowDiskUse=True)
+    return [_clean_content_doc_enhanced(db, doc, tenant_schema) for doc in cursor]
+
+
 def _clean_content_doc_enhanced(db, doc: Dict, tenant_schema) -> Dict:
-    """Enhanced version with all relationships resolved"""
+    """
+    Enhanced version with all relationships resolved - from the joined arrays when the doc
+    came through _fetch_sitemaps_resolved, otherwise one lookup per reference
+    """
     if not doc:
         return {}
 
@@ -462,8 +598,20 @@ def _clean_content_doc_enhanced(db, doc: Dict, tenant_schema) -> Dict:
     if tenant_schema:
         for field_name, mapping in tenant_schema.field_mappings.items():
             raw_value = doc.get(mapping.field_path)
+            joined = doc.get(_JOINED_PREFIX + mapping.field_path)
 
-            if mapping.requires_join and mapping.reference_collection:
+            if mapping.requires_join and mapping.reference_collection and joined is not None:
+                if mapping.field_path == "categoryAttribute" and isinstance(raw_value, list):
+                    if mapping.join_config:
+                        category_id = mapping.join_config["filter_value"]
+                        cleaned[field_name] = [ref["name"] for ref in joined if ref.get("category") == category_id]
+                else:
+                    names = {ref["_id"]: ref.get("name") for ref in joined}
+                    if isinstance(raw_value, list):
+                        cleaned[field_name] = [names.get(v) for v in raw_value if v]
+                    else:
+                        cleaned[field_name] = names.get(raw_value) if raw_value else None
+            elif mapping.requires_join and mapping.reference_collection:
                 if mapping.field_path == "categoryAttribute" and isinstance(raw_value, list):
                     # Handle category attribute arrays with category filtering
                     if mapping.join_config:
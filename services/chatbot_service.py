@@ -5,7 +5,7 @@ from typing import Dict, Any, Optional
 from dataclasses import dataclass, asdict
 from controlflow_core.tasks import process_user_query, process_user_query_async, ControlFlowPipeline
 from controlflow_core.agent import create_query_context, QueryResponse
-from database.queries import create_search_indexes
+from database.queries import create_search_indexes, create_tenant_indexes
 from database.connection import get_database
 from utils.logger import get_logger
 from utils.security import sanitize_input, validate_tenant_access
@@ -55,6 +55,7 @@ class ControlFlowChatbotService:
             # Create search indexes
             db = get_database()
             create_search_indexes(db)
+            create_tenant_indexes(db)
             logger.info(f"Chatbot service initialized for tenant {self.config.tenant_id}")
         except Exception as e:
             logger.warning(f"Failed to initialize search indexes: {e}")
@@ -0,0 +1,64 @@
+"""
+Checks that ControlFlowPipeline only answers from the Python template when the extracted
+category filters are the whole request - anything else must fall through to the LLM path.
+
+Run with: python -m unittest test_templated_response
+"""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from controlflow_core.agent import create_query_context
+from controlflow_core.tasks import ControlFlowPipeline
+
+TENANT_ID = "6875f3afc8337606d54a7f37"
+
+# Only .categories is read by entity extraction
+TENANT_SCHEMA = SimpleNamespace(categories={
+    "Funnel Stage": ["TOFU", "MOFU", "BOFU"],
+    "Industry": ["Fashion", "Financial Services"],
+    "Page Type": ["Product Page", "Blog Post"],
+})
+
+
+class TemplatedResponseTests(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            patch("controlflow_core.tasks.create_tenant_agent"),
+            patch("controlflow_core.tasks.fetch_content_count", return_value=12),
+            patch("controlflow_core.tasks.fetch_content_by_filters", return_value=[{"title": "Page"}]),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.pipeline = ControlFlowPipeline(TENANT_ID)
+
+    def templated(self, user_query):
+        query_context = create_query_context(TENANT_ID, user_query, tenant_schema=TENANT_SCHEMA)
+        return asyncio.run(self.pipeline._templated_response(query_context))
+
+    def test_plain_count_is_templated(self):
+        response = self.templated("How many TOFU pages do we have?")
+        self.assertIsNotNone(response)
+        self.assertEqual(response.data[0]["count"], 12)
+
+    def test_plain_list_is_templated(self):
+        self.assertIsNotNone(self.templated("Show me TOFU content"))
+
+    def test_count_with_topic_is_not_templated(self):
+        # "about crypto" is not a category filter - counting all TOFU pages would be wrong
+        self.assertIsNone(self.templated("How many TOFU pages about crypto?"))
+
+    def test_grouped_count_is_not_templated(self):
+        # Asks for a per-stage breakdown, not one Fashion total
+        self.assertIsNone(self.templated("how many pages per funnel stage in fashion"))
+
+    def test_sorted_list_is_not_templated(self):
+        # sort_by_date modifier - the template can't order by recency
+        self.assertIsNone(self.templated("Show me recent TOFU content"))
+
+
+if __name__ == "__main__":
+    unittest.main()